@@ -22,6 +22,11 @@ META_ALIASES = {
 
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
+# Charset permitido para las claves de metadatos (KEY: value)
+_META_KEY_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+# Primer carácter no-blanco y el resto de su línea
+_FIRST_LINE_RE = re.compile(r"\S[^\n]*")
+
 def clean_snippet_line(line: str) -> str:
     # remove ALL pipes for snippet only
     s = (line or "").replace("|", " ")
@@ -40,12 +45,12 @@ def parse_meta_and_body(raw: str) -> Tuple[Dict[str, str], str]:
         if not line.strip():
             i += 1
             break
-        m = re.match(r"^\s*([A-Z_]+)\s*:\s*(.*)\s*$", line)
-        if not m:
+        k, sep, v = line.partition(":")
+        k = k.strip()
+        if not sep or not k or not _META_KEY_CHARS.issuperset(k):
             break
-        k, v = m.group(1), m.group(2)
         if k in META_ALIASES:
-            meta[META_ALIASES[k]] = v
+            meta[META_ALIASES[k]] = v.strip()
         i += 1
     body = "\n".join(lines[i:]).strip()
     return meta, body
@@ -62,11 +67,8 @@ def extract_sections(body: str) -> Dict[str, str]:
     return sections
 
 def first_nonempty_line(s: str) -> str:
-    for line in s.splitlines():
-        t = line.strip()
-        if t:
-            return t
-    return ""
+    m = _FIRST_LINE_RE.search(s)
+    return m.group(0).rstrip() if m else ""
 
 
 def sanitize_snippet(s: str) -> str:
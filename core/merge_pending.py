@@ -49,7 +49,10 @@ def strip_accents(s: str) -> str:
 
 
 def norm_word(s: str) -> str:
-    s = strip_accents(s).lower().strip()
+    # ASCII puro: NFKD no cambia nada, nos ahorramos el recorrido por carácter
+    if not s.isascii():
+        s = strip_accents(s)
+    s = s.lower().strip()
     s = " ".join(s.split())
     return s
 
@@ -79,10 +82,13 @@ def normalize_keywords(payload: Any) -> List[Dict[str, Any]]:
         w = norm_word(str(item.get("word", "")))
         if not w:
             continue
-        try:
-            weight = int(item.get("weight", 1))
-        except Exception:
-            weight = 1
+        weight = item.get("weight", 1)
+        if type(weight) is not int:
+            # Solo lo no-int paga la conversión (y la excepción si es None/basura)
+            try:
+                weight = int(weight)
+            except Exception:
+                weight = 1
         weight = max(1, min(3, weight))
         best[w] = max(best.get(w, 0), weight)
 
@@ -119,22 +125,42 @@ def build_entry_from_txt(txt_path: Path, pending_entry_out: Path) -> Dict[str, A
 # -----------------------------
 # Merge logic
 # -----------------------------
-def upsert_entry(entries: List[Dict[str, Any]], entry: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int, bool]:
+def index_by_date(entries: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    date -> posición de la PRIMERA entry con esa fecha (misma semántica que un scan lineal).
+    """
+    by_date: Dict[str, int] = {}
+    for i, e in enumerate(entries):
+        d = e.get("date")
+        if d and d not in by_date:
+            by_date[d] = i
+    return by_date
+
+
+def upsert_entry(
+    entries: List[Dict[str, Any]],
+    entry: Dict[str, Any],
+    by_date: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], int, bool]:
     """
     Replace entry with same date if exists, else append.
+    by_date: índice de index_by_date(entries) (se construye si no se pasa).
     Returns: (new_entries, index, existed_before)
     """
     date = entry.get("date")
     if not date:
         raise SystemExit("Entry inválido: falta 'date'.")
 
-    for i, e in enumerate(entries):
-        if e.get("date") == date:
-            new_entries = list(entries)
-            new_entries[i] = entry
-            return new_entries, i, True
+    if by_date is None:
+        by_date = index_by_date(entries)
+
+    new_entries = list(entries)
+    i = by_date.get(date)
+    if i is not None:
+        new_entries[i] = entry
+        return new_entries, i, True
 
-    new_entries = list(entries) + [entry]
+    new_entries.append(entry)
     return new_entries, len(new_entries) - 1, False
 
 
@@ -171,13 +197,15 @@ def main() -> None:
         raise SystemExit(f"Falta archivo.json: {archivo}")
 
     data_root, entries = load_archivo(archivo)
+    by_date = index_by_date(entries)
 
     # Build entry from .txt (source of truth for structure)
     entry = build_entry_from_txt(txt_path, pending_entry_path)
     date = entry["date"]
 
     # Find old entry (for change detection / preserving keywords)
-    old_entry = next((e for e in entries if e.get("date") == date), None)
+    old_idx = by_date.get(date)
+    old_entry = entries[old_idx] if old_idx is not None else None
 
     applied_keywords = False
     if APPLY_KW:
@@ -212,7 +240,7 @@ def main() -> None:
     _atomic_write_json(pending_entry_path, entry)
 
     # Merge into entries
-    new_entries, idx, existed = upsert_entry(entries, entry)
+    new_entries, idx, existed = upsert_entry(entries, entry, by_date)
 
     if args.sort_by_date:
         new_entries.sort(key=lambda e: e.get("date", ""))  # assumes YYYY-MM-DD
@@ -6,15 +6,17 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from dataclasses import dataclass
 from datetime import date as dt
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 SECTION_ORDER = ["POEMA", "POEMA_CITADO", "TEXTO"]
 META_KEYS = ["FECHA", "MY_POEM_TITLE", "POETA", "POEM_TITLE", "BOOK_TITLE"]
 
-HDR_RE = re.compile(r"(?m)^\s*#\s*(POEMA|POEMA_CITADO|TEXTO)\s*$")
+# [^\S\n]: horizontal whitespace only, so a header match never spills into neighbouring lines
+HDR_RE = re.compile(r"(?m)^[^\S\n]*#[^\S\n]*(POEMA_CITADO|POEMA|TEXTO)[^\S\n]*$")
 META_LINE_RE = re.compile(r"^\s*([A-Z_]+)\s*:\s*(.*)\s*$")
 
 
@@ -22,6 +24,7 @@ META_LINE_RE = re.compile(r"^\s*([A-Z_]+)\s*:\s*(.*)\s*$")
 class Parsed:
     meta_raw: Dict[str, str]
     sections: Dict[str, str]
+    raw: str = ""
 
 
 def _read(path: Path) -> str:
@@ -50,15 +53,18 @@ def _parse_meta_and_rest(raw: str) -> Tuple[Dict[str, str], str]:
     return meta, rest
 
 
-def _extract_sections(body: str) -> Dict[str, str]:
+def _extract_sections(body: str) -> Tuple[Dict[str, str], List[str]]:
+    """Sections by name plus the header names in the order they appear."""
     matches = list(HDR_RE.finditer(body))
     out: Dict[str, str] = {}
+    order: List[str] = []
     for idx, m in enumerate(matches):
         name = m.group(1)
         start = m.end()
         end = matches[idx + 1].start() if idx + 1 < len(matches) else len(body)
         out[name] = body[start:end]
-    return out
+        order.append(name)
+    return out, order
 
 
 def _is_real_iso_date(s: str) -> bool:
@@ -91,16 +97,13 @@ def parse_and_validate(date_str: str, txt_path: Path) -> Parsed:
         raise SystemExit(f"Nombre de archivo ({txt_path.stem}) no coincide con FECHA ({date_str})")
 
     # sections
-    sections = _extract_sections(body)
+    sections, order = _extract_sections(body)
     for name in SECTION_ORDER:
         if name not in sections:
             raise SystemExit(f"Falta sección: # {name}")
 
-    # order check
-    positions = {name: body.find(f"# {name}") for name in SECTION_ORDER}
-    if not (positions["POEMA"] != -1 and positions["POEMA_CITADO"] != -1 and positions["TEXTO"] != -1):
-        raise SystemExit("Headers no encontrados (error interno)")
-    if not (positions["POEMA"] < positions["POEMA_CITADO"] < positions["TEXTO"]):
+    # order check: headers as matched above (each exactly once, in order)
+    if order != SECTION_ORDER:
         raise SystemExit("Orden inválido: debe ser # POEMA, luego # POEMA_CITADO, luego # TEXTO")
 
     # content non-empty (strip only whitespace/newlines)
@@ -109,10 +112,10 @@ def parse_and_validate(date_str: str, txt_path: Path) -> Parsed:
         if not content.strip():
             raise SystemExit(f"Sección vacía: # {name}")
 
-    return Parsed(meta_raw=meta, sections=sections)
+    return Parsed(meta_raw=meta, sections=sections, raw=raw)
 
 
-def normalize_text(date_str: str, txt_path: Path) -> Tuple[str, bool]:
+def normalize_text(date_str: str, txt_path: Path, parsed: Optional[Parsed] = None) -> Tuple[str, bool]:
     """
     Normalize ONLY:
       - metadata lines: 'KEY: value' with single space after colon, keys in fixed order
@@ -121,10 +124,15 @@ def normalize_text(date_str: str, txt_path: Path) -> Tuple[str, bool]:
           - before each header
           - after each header
     NEVER modifies section content except trimming leading/trailing blank lines of each section.
+
+    parsed: result of parse_and_validate on the same file (skips reading/parsing it again).
     """
-    raw = _read(txt_path)
-    meta, body = _parse_meta_and_rest(raw)
-    sections = _extract_sections(body)
+    if parsed is not None:
+        raw, meta, sections = parsed.raw, parsed.meta_raw, parsed.sections
+    else:
+        raw = _read(txt_path)
+        meta, body = _parse_meta_and_rest(raw)
+        sections, _order = _extract_sections(body)
 
     # Keep metadata values, but normalize FECHA to exact date_str
     meta2 = {k: meta.get(k, "") for k in META_KEYS}
@@ -136,35 +144,40 @@ def normalize_text(date_str: str, txt_path: Path) -> Tuple[str, bool]:
     meta_block = "\n".join(meta_lines).rstrip()
 
     def clean_section(s: str) -> str:
-        # trim only outer whitespace lines; keep internal formatting untouched
-        return s.strip("\n").rstrip()  # keep internal newlines/spaces
+        # trim only outer blank (or whitespace-only) lines; keep internal formatting untouched
+        # cut at the line breaks around the first/last non-whitespace char
+        tail = s.rstrip()
+        if not tail:
+            return ""
+        start = s.rfind("\n", 0, len(s) - len(s.lstrip())) + 1
+        end = s.find("\n", len(tail))
+        return s[start:] if end == -1 else s[start:end]
 
     poema = clean_section(sections["POEMA"])
     citado = clean_section(sections["POEMA_CITADO"])
     texto = clean_section(sections["TEXTO"])
 
-    parts = []
-    parts.append(meta_block)
-    parts.append("")  # one blank line after metadata
-
-    def add_section(name: str, content: str):
-        # one blank line before header is already ensured by join logic
-        parts.append(f"# {name}")
-        parts.append("")  # one blank line after header
-        parts.append(content)
-
-    add_section("POEMA", poema)
-    parts.append("")  # one blank line between sections
-    add_section("POEMA_CITADO", citado)
-    parts.append("")
-    add_section("TEXTO", texto)
-
-    normalized = "\n".join(parts).rstrip() + "\n"
+    # one blank line after metadata, before/after each header and between sections;
+    # an empty TEXTO must not leave trailing blank lines after its header
+    normalized = (
+        f"{meta_block}\n\n"
+        f"# POEMA\n\n{poema}\n\n"
+        f"# POEMA_CITADO\n\n{citado}\n\n"
+        f"# TEXTO\n\n{texto}"
+    ).rstrip("\n") + "\n"
     changed = (normalized != raw)
     return normalized, changed
 
 
+def _emit(payload: dict) -> None:
+    """Write payload as one line of UTF-8 JSON, independent of locale and newline translation."""
+    sys.stdout.buffer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
 def main() -> int:
+    # error messages (SystemExit) are read back as UTF-8 by qcrear, same as stdout
+    sys.stderr.reconfigure(encoding="utf-8")
+
     ap = argparse.ArgumentParser()
     ap.add_argument("--mode", choices=["validate", "normalize"], required=True)
     ap.add_argument("date", help="YYYY-MM-DD")
@@ -182,15 +195,15 @@ def main() -> int:
         raise SystemExit(f"No existe: {txt_path}")
 
     # validate always first
-    parse_and_validate(date_str, txt_path)
+    parsed = parse_and_validate(date_str, txt_path)
 
     if args.mode == "validate":
-        print(json.dumps({"ok": True}, ensure_ascii=False))
+        _emit({"ok": True})
         return 0
 
-    normalized, changed = normalize_text(date_str, txt_path)
+    normalized, changed = normalize_text(date_str, txt_path, parsed)
     payload = {"ok": True, "changed_formatting": changed, "normalized_text": normalized}
-    print(json.dumps(payload, ensure_ascii=False))
+    _emit(payload)
     return 0
 
 
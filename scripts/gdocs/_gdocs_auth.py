@@ -1,8 +1,15 @@
 from __future__ import annotations
 import json
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock entre procesos
+    fcntl = None  # type: ignore
 
 from google.auth.credentials import Credentials
 from google.oauth2 import service_account
@@ -14,8 +21,22 @@ SCOPES = ["https://www.googleapis.com/auth/documents.readonly"]
 
 CLIENT_SECRETS = Path("~/.config/qmp/google_oauth_client.json").expanduser()
 TOKEN_PATH = Path("~/.config/qmp/google_token.json").expanduser()
+TOKEN_LOCK_PATH = Path("~/.config/qmp/google_token.lock").expanduser()
 CONFIG_PATH = Path("~/.config/qmp/gdocs.json").expanduser()
 
+# qcrear llama a los pulls en el mismo proceso y en paralelo; qcambiar los lanza
+# como dos subprocess a la vez. Un solo refresh / flujo OAuth a la vez (el
+# segundo lee el token recién guardado): lock de hilo + lock de archivo.
+_CREDS_LOCK = threading.Lock()
+
+@contextmanager
+def _token_file_lock() -> Iterator[None]:
+    TOKEN_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(TOKEN_LOCK_PATH, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)  # se libera al cerrar f
+        yield
+
 def load_config() -> Dict[str, Any]:
     if not CONFIG_PATH.exists():
         raise FileNotFoundError(f"No encuentro config: {CONFIG_PATH}")
@@ -35,18 +56,22 @@ def get_creds() -> Credentials:
     if not CLIENT_SECRETS.exists():
         raise FileNotFoundError(f"No encuentro OAuth client JSON: {CLIENT_SECRETS}")
 
-    creds = None
+    with _CREDS_LOCK, _token_file_lock():
+        creds = None
 
-    if TOKEN_PATH.exists():
-        creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
+        if TOKEN_PATH.exists():
+            creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(str(CLIENT_SECRETS), SCOPES)
-            creds = flow.run_local_server(port=0)
-        TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-        TOKEN_PATH.write_text(creds.to_json(), encoding="utf-8")
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(str(CLIENT_SECRETS), SCOPES)
+                creds = flow.run_local_server(port=0)
+            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # atómico: nadie lee un token a medio escribir
+            tmp = TOKEN_PATH.with_name(TOKEN_PATH.name + ".tmp")
+            tmp.write_text(creds.to_json(), encoding="utf-8")
+            os.replace(tmp, TOKEN_PATH)
 
-    return creds
\ No newline at end of file
+        return creds
\ No newline at end of file
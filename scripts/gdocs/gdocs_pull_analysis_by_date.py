@@ -210,6 +210,26 @@ def pull_entry(doc_id: str, tab_title: str, yymmdd: str) -> dict:
     }
 
 
+class ConfigError(RuntimeError):
+    pass
+
+
+def fetch(date_str: str, tab: Optional[str] = None, doc: Optional[str] = None) -> dict:
+    """
+    Pull del análisis para date_str (YYYY-MM-DD). Mismo dict que imprime main();
+    qcrear lo llama en el mismo proceso en vez de lanzar este script.
+    Lanza ConfigError / FormatError / KeyError (main los traduce a exit code).
+    """
+    cfg = load_config()
+    doc_id = doc or cfg.get("analyses_doc_id")
+    tab_title = tab or cfg.get("analyses_tab_title") or "Escritos"
+    if not doc_id:
+        raise ConfigError("missing analyses_doc_id in config")
+
+    yymmdd = yyyymmdd_to_yymmdd(date_str)
+    return pull_entry(doc_id, tab_title, yymmdd)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--date", required=True, help="YYYY-MM-DD")
@@ -217,17 +237,11 @@ def main() -> int:
     ap.add_argument("--doc", default=None)
     args = ap.parse_args()
 
-    cfg = load_config()
-    doc_id = args.doc or cfg.get("analyses_doc_id")
-    tab_title = args.tab or cfg.get("analyses_tab_title") or "Escritos"
-    if not doc_id:
-        print("ERROR: missing analyses_doc_id in config", file=sys.stderr)
-        return 2
-
-    yymmdd = yyyymmdd_to_yymmdd(args.date)
-
     try:
-        obj = pull_entry(doc_id, tab_title, yymmdd)
+        obj = fetch(args.date, tab=args.tab, doc=args.doc)
+    except ConfigError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
     except FormatError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 3
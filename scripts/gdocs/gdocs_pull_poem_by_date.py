@@ -162,6 +162,26 @@ def pull_poem(doc_id: str, tab_title: str, yymmdd: str) -> Tuple[str, str]:
     return (title, poem)
 
 
+class ConfigError(RuntimeError):
+    pass
+
+
+def fetch(date_str: str, tab: Optional[str] = None, doc: Optional[str] = None) -> dict:
+    """
+    Pull del poema para date_str (YYYY-MM-DD). Mismo dict que imprime main();
+    qcrear lo llama en el mismo proceso en vez de lanzar este script.
+    """
+    cfg = load_config()
+    doc_id = doc or cfg.get("poems_doc_id")
+    tab_title = tab or cfg.get("poems_tab_title") or "Poemas finales"
+    if not doc_id:
+        raise ConfigError("missing poems_doc_id in config")
+
+    yymmdd = yyyymmdd_to_yymmdd(date_str)
+    title, poem = pull_poem(doc_id, tab_title, yymmdd)
+    return {"title": title, "poem": poem}
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--date", required=True, help="YYYY-MM-DD")
@@ -169,17 +189,13 @@ def main() -> int:
     ap.add_argument("--doc", default=None)
     args = ap.parse_args()
 
-    cfg = load_config()
-    doc_id = args.doc or cfg.get("poems_doc_id")
-    tab_title = args.tab or cfg.get("poems_tab_title") or "Poemas finales"
-    if not doc_id:
-        print("ERROR: missing poems_doc_id in config")
+    try:
+        obj = fetch(args.date, tab=args.tab, doc=args.doc)
+    except ConfigError as e:
+        print(f"ERROR: {e}")
         return 2
 
-    yymmdd = yyyymmdd_to_yymmdd(args.date)
-    title, poem = pull_poem(doc_id, tab_title, yymmdd)
-
-    print(json.dumps({"title": title, "poem": poem}, ensure_ascii=False))
+    print(json.dumps(obj, ensure_ascii=False))
     return 0
 
 
@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import hashlib
 import json
+import re
 import subprocess
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 # Ensure scripts/ is importable
 SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
 
@@ -21,13 +24,14 @@ from qcommon import (  # type: ignore
     prompt_yn,
     run_preflight,
     parse_yyyy_mm_dd,
-    load_archivo_json,
-    find_entry_by_date,
-    extract_section,
+    load_entry_by_date,
     normalize_text_for_hash,
+    docs_fingerprint_from_normalized,
     run_py_json,
     write_text_atomic,
     git,
+    json_loads,
+    json_dumps_pretty,
 )
 
 SEP = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -39,8 +43,11 @@ SECTION_KEYS = ["poema", "poema_citado", "texto"]
 # Paths / IO helpers
 # -----------------------------
 
+_TEXTOS_ROOT = REPO_ROOT / "data" / "textos"
+
+
 def repo_root() -> Path:
-    return Path(__file__).resolve().parent.parent
+    return REPO_ROOT
 
 
 def state_dir() -> Path:
@@ -60,12 +67,17 @@ def pending_entry_path() -> Path:
 
 
 def txt_path_for_date(date_str: str) -> Path:
-    y, m, _d = date_str.split("-")
-    return repo_root() / "data" / "textos" / y / m / f"{date_str}.txt"
+    # date_str ya validado como YYYY-MM-DD: año y mes por posición
+    return _TEXTOS_ROOT / date_str[:4] / date_str[5:7] / f"{date_str}.txt"
+
+
+_CRLF_RE = re.compile(r"\r\n?")
 
 
 def _norm_newlines(s: str) -> str:
-    return (s or "").replace("\r\n", "\n").replace("\r", "\n")
+    # Una sola pasada (y ninguna si no hay \r, el caso normal)
+    s = s or ""
+    return _CRLF_RE.sub("\n", s) if "\r" in s else s
 
 
 def _clean_section_for_write(s: str) -> str:
@@ -79,101 +91,235 @@ def git_status_porcelain() -> List[str]:
     return [ln.rstrip("\n") for ln in out if ln.strip()]
 
 
+def git_branch_and_status() -> Tuple[str, List[str]]:
+    """
+    Un solo `git status --porcelain --branch`: branch actual + líneas de status.
+    Reemplaza rev-parse --abbrev-ref HEAD + git status por separado.
+    """
+    # -uall: untracked listados archivo por archivo (no colapsados por directorio)
+    out = git(["status", "--porcelain", "--branch", "--untracked-files=all"]).splitlines()
+    branch = "HEAD"
+    if out and out[0].startswith("## "):
+        head = out.pop(0)[3:]
+        head = head.replace("No commits yet on ", "").replace("Initial commit on ", "")
+        if not head.startswith("HEAD (no branch)"):
+            branch = head.split("...", 1)[0].split(" ", 1)[0]
+    return branch, [ln for ln in out if ln.strip()]
+
+
 def git_file_has_diff(path: Path) -> bool:
+    """
+    True si el archivo no está en el índice (untracked o ignorado) o si el
+    worktree difiere del índice (lo staged no cuenta, igual que `git diff`).
+    Un solo `git status` en vez de ls-files + diff.
+    """
     if not path.exists():
         return False
-    proc = subprocess.run(["git", "ls-files", "--error-unmatch", str(path)],
-                          capture_output=True, text=True)
+    proc = subprocess.run(
+        ["git", "status", "--porcelain=v1", "-z", "--ignored", "--", str(path)],
+        capture_output=True,
+    )
     if proc.returncode != 0:
-        return True  # untracked
-    proc2 = subprocess.run(["git", "diff", "--quiet", "--", str(path)])
-    return proc2.returncode != 0
+        err = (proc.stderr or b"").decode("utf-8", "replace").strip()
+        raise RuntimeError(f"git status falló para {path}:\n{err}")
+
+    fields = proc.stdout.split(b"\0")
+    i = 0
+    while i < len(fields):
+        rec = fields[i]
+        i += 1
+        if len(rec) < 3:
+            continue
+        xy = rec[:2]
+        if xy in (b"??", b"!!"):
+            return True  # fuera del índice
+        if xy[1:2] != b" ":
+            return True  # worktree != índice
+        if xy[0:1] in (b"R", b"C"):
+            i += 1  # -z: rename/copy trae el path de origen como campo aparte
+    return False
 
 
-def parse_metadata_from_txt(raw: str) -> Dict[str, str]:
-    out: Dict[str, str] = {}
-    for line in _norm_newlines(raw).splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        if line in {"# POEMA", "# POEMA_CITADO", "# TEXTO"}:
-            break
-        if line.startswith("#"):
+_SECTION_BY_HEADER = {"# POEMA": "poema", "# POEMA_CITADO": "poema_citado", "# TEXTO": "texto"}
+_META_KEYS = frozenset(DATE_KEYS)
+# KEY: value sobre la línea ya strip()eada (valor sin espacios al inicio)
+_META_LINE_RE = re.compile(r"([A-Z_]+)\s*:\s*(.*)")
+
+
+def _parse_txt_once(raw: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Una sola pasada sobre el .txt: (metadatos DATE_KEYS, secciones SECTION_KEYS).
+    Secciones con la misma semántica que extract_section (primer header exacto
+    hasta la siguiente línea "# ..."). El bloque de metadatos termina en el
+    primer header o en la primera línea que no sea KEY: value / comentario / vacía.
+    """
+    meta: Dict[str, str] = {}
+    buf: Dict[str, List[str]] = {}
+    cur: Optional[List[str]] = None
+    in_meta = True
+    for ln in _norm_newlines(raw).split("\n"):
+        if in_meta:
+            line = ln.strip()
+            if line in _SECTION_BY_HEADER:
+                in_meta = False
+            elif line and not line.startswith("#"):
+                m = _META_LINE_RE.fullmatch(line)
+                if m is None:
+                    in_meta = False
+                elif m.group(1) in _META_KEYS:
+                    meta[m.group(1)] = m.group(2)
+        if ln.startswith("# "):
+            key = _SECTION_BY_HEADER.get(ln)
+            if key is not None and key not in buf:
+                cur = buf[key] = []
+            else:
+                cur = None
             continue
-        if ":" in line:
-            k, v = line.split(":", 1)
-            k = k.strip()
-            v = v.strip()
-            if k in set(DATE_KEYS):
-                out[k] = v
-    return out
+        if cur is not None:
+            cur.append(ln)
+    return meta, {k: "\n".join(buf.get(k, ())) for k in SECTION_KEYS}
+
+
+@lru_cache(maxsize=4)
+def _parse_txt_cached(path_str: str, ino: int, mtime_ns: int, size: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+    return _parse_txt_once(Path(path_str).read_text(encoding="utf-8"))
+
+
+def parse_txt_file(path: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    _parse_txt_once sobre el archivo, cacheado por (path, inode, mtime, size):
+    write_text_atomic crea un inode nuevo, así que una reescritura invalida.
+    NO mutar los dicts devueltos.
+    """
+    st = path.stat()
+    return _parse_txt_cached(str(path), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def parse_metadata_from_txt(raw: str) -> Dict[str, str]:
+    return _parse_txt_once(raw)[0]
 
 
 def read_current_payload(date_str: str, txt_path: Path) -> Dict[str, Any]:
     if not txt_path.exists():
         return {"date": date_str, **{k: "" for k in DATE_KEYS}, **{k: "" for k in SECTION_KEYS}}
-    raw = txt_path.read_text(encoding="utf-8")
-    meta = parse_metadata_from_txt(raw)
+    meta, sections = parse_txt_file(txt_path)
+    return _payload_from_parsed(date_str, meta, sections)
+
+
+def _payload_from_parsed(date_str: str, meta: Dict[str, str], sections: Dict[str, str]) -> Dict[str, Any]:
     return {
         "date": date_str,
-        "MY_POEM_TITLE": meta.get("MY_POEM_TITLE", ""),
-        "POETA": meta.get("POETA", ""),
-        "POEM_TITLE": meta.get("POEM_TITLE", ""),
-        "BOOK_TITLE": meta.get("BOOK_TITLE", ""),
-        "poema": extract_section(raw, "# POEMA"),
-        "poema_citado": extract_section(raw, "# POEMA_CITADO"),
-        "texto": extract_section(raw, "# TEXTO"),
+        **{k: meta.get(k, "") for k in DATE_KEYS},
+        **sections,
     }
 
 
-def normalize_pulled_payload(pulled: Dict[str, Any]) -> Dict[str, Any]:
-    out = dict(pulled or {})
-    # poem pull
-    if "poem" in out and "poema" not in out:
-        out["poema"] = out.get("poem", "")
-    if "title" in out and "MY_POEM_TITLE" not in out:
-        out["MY_POEM_TITLE"] = out.get("title", "")
-    # analysis pull
-    if "analysis" in out and "texto" not in out:
-        out["texto"] = out.get("analysis", "")
-    if "poem_citado" in out and "poema_citado" not in out:
-        out["poema_citado"] = out.get("poem_citado", "")
-    # metadata
-    if "poet" in out and "POETA" not in out:
-        out["POETA"] = out.get("poet", "")
-    if "poem_title" in out and "POEM_TITLE" not in out:
-        out["POEM_TITLE"] = out.get("poem_title", "")
-    if "book_title" in out and "BOOK_TITLE" not in out:
-        out["BOOK_TITLE"] = out.get("book_title", "")
+def read_head_payload(date_str: str, txt_path: Path) -> Dict[str, Any]:
+    """
+    Payload del .txt tal como está en HEAD (para --local: comparar sin Google Docs).
+    Si el archivo no está en HEAD, payload vacío.
+    """
+    rel = txt_path.resolve().relative_to(REPO_ROOT).as_posix()
+    try:
+        raw = git(["show", f"HEAD:{rel}"])
+    except RuntimeError:
+        raw = ""
+    meta, sections = _parse_txt_once(raw)
+    return _payload_from_parsed(date_str, meta, sections)
+
+
+def _collect_gdocs_payload(date_str: str, f_poem: "Future[dict]", f_analysis: "Future[dict]") -> Dict[str, Any]:
+    try:
+        poem_pull = f_poem.result()
+    except Exception as e:
+        raise RuntimeError(f"Fallo pull de POEMA (Google Docs) para {date_str}: {e}") from e
+
+    try:
+        analysis_pull = f_analysis.result()
+    except Exception as e:
+        raise RuntimeError(f"Fallo pull de ANÁLISIS (Google Docs) para {date_str}: {e}") from e
+
+    pulled_raw: Dict[str, Any] = {}
+    pulled_raw.update(poem_pull or {})
+    pulled_raw.update(analysis_pull or {})
+    pulled = normalize_pulled_payload_inplace(pulled_raw)
+
+    for k in DATE_KEYS + SECTION_KEYS:
+        pulled.setdefault(k, "")
+    return pulled
+
+
+def start_gdocs_pull(date_str: str) -> "Future[Dict[str, Any]]":
+    """
+    Lanza ambos pulls (subprocess + red, independientes) en paralelo y devuelve
+    un Future con el payload ya normalizado. main() lee el .txt mientras tanto.
+    Los dos subprocess pueden necesitar el token a la vez: get_creds() los
+    serializa con un lock de archivo (ver _gdocs_auth).
+    """
+    ex = ThreadPoolExecutor(max_workers=3)
+    f_poem = ex.submit(run_py_json, "scripts/gdocs/gdocs_pull_poem_by_date.py", ["--date", date_str])
+    f_analysis = ex.submit(run_py_json, "scripts/gdocs/gdocs_pull_analysis_by_date.py", ["--date", date_str])
+    f_payload = ex.submit(_collect_gdocs_payload, date_str, f_poem, f_analysis)
+    ex.shutdown(wait=False)  # no más tareas; las ya enviadas terminan solas
+    return f_payload
+
+
+# poem pull: poem/title; analysis pull: analysis/poem_citado; metadata: poet/poem_title/book_title
+_PULL_KEY_ALIASES = (
+    ("poema", "poem"),
+    ("MY_POEM_TITLE", "title"),
+    ("texto", "analysis"),
+    ("poema_citado", "poem_citado"),
+    ("POETA", "poet"),
+    ("POEM_TITLE", "poem_title"),
+    ("BOOK_TITLE", "book_title"),
+)
+_PULL_CANONICAL_KEYS = frozenset(canon for canon, _ in _PULL_KEY_ALIASES)
+
+
+def normalize_pulled_payload_inplace(pulled: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normaliza el payload del pull modificándolo en sitio (sin copiar el dict;
+    el llamador lo arma fresco) y lo devuelve.
+    """
+    out = pulled
+    # Alias del pull -> clave canónica (solo si la canónica no vino ya)
+    if not _PULL_CANONICAL_KEYS.issubset(out):
+        for canon, alias in _PULL_KEY_ALIASES:
+            if alias in out:
+                out.setdefault(canon, out[alias])
 
     # normalize line endings
     for k, v in list(out.items()):
         if isinstance(v, str):
             out[k] = _norm_newlines(v)
+    # metadata limpia una sola vez aquí (igual que parse_metadata_from_txt);
+    # preview/diff/render confían en ella sin volver a hacer strip
+    for k in DATE_KEYS:
+        out[k] = (out.get(k) or "").strip()
     return out
 
 
+# normalize_text_for_hash memoizado: el texto publicado se normaliza en el diff
+# y otra vez en docs_fingerprint; los str son inmutables, así que es seguro.
+_norm = lru_cache(maxsize=64)(normalize_text_for_hash)
+
+
 # -----------------------------
 # Fingerprints (same spirit as qcrear)
 # -----------------------------
 
 def docs_fingerprint(poem: str, poem_citado: str, texto: str) -> str:
-    payload = "\n\n---\n\n".join([
-        normalize_text_for_hash(poem),
-        normalize_text_for_hash(poem_citado),
-        normalize_text_for_hash(texto),
-    ])
-    h = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{h}"
+    return docs_fingerprint_from_normalized(_norm(poem), _norm(poem_citado), _norm(texto))
 
 
 def txt_fingerprint_from_file(path: Path) -> Optional[str]:
     if not path.exists():
         return None
-    raw = path.read_text(encoding="utf-8")
-    poema = extract_section(raw, "# POEMA")
-    citado = extract_section(raw, "# POEMA_CITADO")
-    texto = extract_section(raw, "# TEXTO")
+    _meta, sections = parse_txt_file(path)
+    poema = sections["poema"]
+    citado = sections["poema_citado"]
+    texto = sections["texto"]
     # Permitimos secciones vacías (en algunos casos poem_citado podría ser vacío).
     return docs_fingerprint(poema, citado, texto)
 
@@ -183,12 +329,10 @@ def txt_fingerprint_from_file(path: Path) -> Optional[str]:
 # -----------------------------
 
 def load_pending_keywords() -> Optional[dict]:
-    p = pending_kw_path()
-    if not p.exists():
-        return None
+    # Un solo open (sin exists() previo); json_loads acepta bytes UTF-8 directo
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
+        obj = json_loads(pending_kw_path().read_bytes())
+    except Exception:  # incluye FileNotFoundError
         return None
     if not isinstance(obj, dict):
         return None
@@ -204,23 +348,39 @@ def pending_keywords_for_date(obj: Optional[dict], date_str: str) -> bool:
     return bool(obj) and str(obj.get("date", "")).strip() == date_str and isinstance(obj.get("keywords", None), list)
 
 
-def write_pending_keywords(target: str, keywords: list[dict], docs_fp: str) -> None:
+def write_pending_keywords(target: str, keywords: list[dict], docs_fp: str) -> dict:
+    """
+    Escribe pending_keywords.txt y devuelve el payload escrito (lo mismo que
+    load_pending_keywords() leería de vuelta, sin releer el archivo).
+    """
     payload = {
         "date": target,
         "docs_fingerprint": docs_fp,
         "keywords": keywords,
         "generated_at": datetime.now().isoformat(timespec="seconds"),
     }
-    pending_kw_path().write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_text_atomic(pending_kw_path(), json_dumps_pretty(payload) + "\n")
+    return payload
+
+
+def regenerate_pending_keywords(date_str: str, txt_path: Path, current_payload: Dict[str, Any]) -> dict:
+    """gen_keywords sobre el .txt → pending_keywords.txt (con fingerprint del .txt)."""
+    kws = generate_keywords_from_txt(txt_path)
+    fp = txt_fingerprint_from_file(txt_path) or docs_fingerprint(
+        current_payload.get("poema", ""),
+        current_payload.get("poema_citado", ""),
+        current_payload.get("texto", ""),
+    )
+    return write_pending_keywords(date_str, kws, fp)
 
 
 def reset_pending_files() -> None:
     # Igual espíritu que qcrear: dejar placeholder limpio tras publish
-    pending_kw_path().write_text(
-        json.dumps({"date": "", "docs_fingerprint": "", "keywords": []}, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    write_text_atomic(
+        pending_kw_path(),
+        json_dumps_pretty({"date": "", "docs_fingerprint": "", "keywords": []}) + "\n",
     )
-    pending_entry_path().write_text("{}", encoding="utf-8")
+    write_text_atomic(pending_entry_path(), "{}")
 
 
 def keywords_from_archivo_entry(entry: Dict[str, Any]) -> List[Tuple[str, int]]:
@@ -267,13 +427,15 @@ def generate_keywords_from_txt(txt_path: Path) -> list[dict]:
 
     # IMPORTANT: usamos el txt_path (no date) para evitar “fecha equivocada”
     cmd = [sys.executable, str(script), str(txt_path)]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # bytes: json_loads parsea UTF-8 directo; solo decodificamos texto si falla
+    proc = subprocess.run(cmd, capture_output=True)
     if proc.returncode != 0:
-        raise RuntimeError(f"Falló generación de keywords:\n{proc.stderr or proc.stdout}")
+        detail = (proc.stderr or proc.stdout).decode("utf-8", errors="replace")
+        raise RuntimeError(f"Falló generación de keywords:\n{detail}")
 
     try:
-        obj = json.loads(proc.stdout)
-    except json.JSONDecodeError:
+        obj = json_loads(proc.stdout)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         raise RuntimeError("gen_keywords.py no devolvió JSON válido.")
 
     if isinstance(obj, dict) and "keywords" in obj:
@@ -300,63 +462,73 @@ def generate_keywords_from_txt(txt_path: Path) -> list[dict]:
 # Render / preview / diffs
 # -----------------------------
 
-def render_txt(target: str, payload: Dict[str, Any]) -> str:
-    parts: List[str] = []
-    parts.append(f"FECHA: {target}")
-
-    # metadata (si vacío, lo dejamos igual como línea vacía; consistente)
-    parts.append(f"MY_POEM_TITLE: {_clean_section_for_write(payload.get('MY_POEM_TITLE',''))}")
-    parts.append(f"POETA: {_clean_section_for_write(payload.get('POETA',''))}")
-    parts.append(f"POEM_TITLE: {_clean_section_for_write(payload.get('POEM_TITLE',''))}")
-    parts.append(f"BOOK_TITLE: {_clean_section_for_write(payload.get('BOOK_TITLE',''))}")
-    parts.append("")
-
-    parts.append("# POEMA")
-    parts.append(_clean_section_for_write(payload.get("poema", "")))
-    parts.append("")
+# Forma fija del .txt: un solo format_map en vez de armar lista + join
+_TXT_TEMPLATE = (
+    "FECHA: {date}\n"
+    "MY_POEM_TITLE: {MY_POEM_TITLE}\n"
+    "POETA: {POETA}\n"
+    "POEM_TITLE: {POEM_TITLE}\n"
+    "BOOK_TITLE: {BOOK_TITLE}\n"
+    "\n"
+    "# POEMA\n"
+    "{poema}\n"
+    "\n"
+    "# POEMA_CITADO\n"
+    "{poema_citado}\n"
+    "\n"
+    "# TEXTO\n"
+    "{texto}\n"
+)
 
-    parts.append("# POEMA_CITADO")
-    parts.append(_clean_section_for_write(payload.get("poema_citado", "")))
-    parts.append("")
 
-    parts.append("# TEXTO")
-    parts.append(_clean_section_for_write(payload.get("texto", "")))
-    parts.append("")
-    return "\n".join(parts)
+def render_txt(target: str, payload: Dict[str, Any]) -> str:
+    # Metadata ya viene limpia (parser / normalize_pulled_payload_inplace); secciones se limpian
+    # una sola vez y el resultado ya sale con \n (sin replace final)
+    # metadata (si vacío, lo dejamos igual como línea vacía; consistente)
+    fields = {k: payload.get(k) or "" for k in DATE_KEYS}
+    fields.update((k, _clean_section_for_write(payload.get(k, ""))) for k in SECTION_KEYS)
+    fields["date"] = target
+    return _TXT_TEMPLATE.format_map(fields)
 
 
 def preview_payload(label: str, payload: Dict[str, Any], n_lines: int = 12) -> None:
-    println(SEP)
-    println(f"[qcambiar] PREVIEW — {label}")
-    println("METADATA:")
+    # Se arma todo el bloque y se emite con un solo println (un write + flush)
+    buf: List[str] = [SEP, f"[qcambiar] PREVIEW — {label}", "METADATA:"]
     for k in DATE_KEYS:
-        println(f"  {k}: {(payload.get(k) or '').strip()}")
-    println("")
+        buf.append(f"  {k}: {payload.get(k) or ''}")
+    buf.append("")
     for sec, header in [("poema", "POEMA"), ("poema_citado", "POEMA_CITADO"), ("texto", "TEXTO")]:
         txt = _norm_newlines(payload.get(sec, "") or "")
         lines = txt.splitlines()
-        println(f"{header} (primeras {min(n_lines,len(lines))} de {len(lines)}):")
-        for ln in lines[:n_lines]:
-            println(f"  {ln}")
-        println("")
-    println(SEP)
+        buf.append(f"{header} (primeras {min(n_lines,len(lines))} de {len(lines)}):")
+        buf.extend(f"  {ln}" for ln in lines[:n_lines])
+        buf.append("")
+    buf.append(SEP)
+    println("\n".join(buf))
+
+
+def _differs(a: str, b: str) -> bool:
+    # Caso común tras un pull: texto idéntico byte a byte → sin normalizar
+    if a == b:
+        return False
+    return _norm(a) != _norm(b)
 
 
 def compute_diff_report(current: Dict[str, Any], pulled: Dict[str, Any]) -> Tuple[bool, bool, List[str]]:
     report: List[str] = []
 
-    poem_changed = normalize_text_for_hash(current.get("poema", "")) != normalize_text_for_hash(pulled.get("poema", ""))
-    citado_changed = normalize_text_for_hash(current.get("poema_citado", "")) != normalize_text_for_hash(pulled.get("poema_citado", ""))
-    texto_changed = normalize_text_for_hash(current.get("texto", "")) != normalize_text_for_hash(pulled.get("texto", ""))
+    poem_changed = _differs(current.get("poema", ""), pulled.get("poema", ""))
+    citado_changed = _differs(current.get("poema_citado", ""), pulled.get("poema_citado", ""))
+    texto_changed = _differs(current.get("texto", ""), pulled.get("texto", ""))
 
     report.append(f"  - POEMA: {'CAMBIÓ' if poem_changed else 'sin cambios'}")
     report.append(f"  - POEMA_CITADO: {'CAMBIÓ' if citado_changed else 'sin cambios'}")
     report.append(f"  - TEXTO: {'CAMBIÓ' if texto_changed else 'sin cambios'}")
 
-    my_title_changed = normalize_text_for_hash(current.get("MY_POEM_TITLE", "")) != normalize_text_for_hash(pulled.get("MY_POEM_TITLE", ""))
-    poeta_changed = normalize_text_for_hash(current.get("POETA", "")) != normalize_text_for_hash(pulled.get("POETA", ""))
-    poem_title_changed = normalize_text_for_hash(current.get("POEM_TITLE", "")) != normalize_text_for_hash(pulled.get("POEM_TITLE", ""))
-    book_title_changed = normalize_text_for_hash(current.get("BOOK_TITLE", "")) != normalize_text_for_hash(pulled.get("BOOK_TITLE", ""))
+    my_title_changed = _differs(current.get("MY_POEM_TITLE", ""), pulled.get("MY_POEM_TITLE", ""))
+    poeta_changed = _differs(current.get("POETA", ""), pulled.get("POETA", ""))
+    poem_title_changed = _differs(current.get("POEM_TITLE", ""), pulled.get("POEM_TITLE", ""))
+    book_title_changed = _differs(current.get("BOOK_TITLE", ""), pulled.get("BOOK_TITLE", ""))
 
     report.append(f"  - MY_POEM_TITLE: {'CAMBIÓ' if my_title_changed else 'sin cambios'}")
     report.append(f"  - POETA: {'CAMBIÓ' if poeta_changed else 'sin cambios'}")
@@ -383,12 +555,12 @@ def build_commit_message(date_str: str, P: bool, A: bool, K: bool) -> str:
     return f"cambio de {' + '.join(parts)} {date_str}"
 
 
-def warn_or_block_dirty_repo(allowed_paths: List[Path]) -> None:
+def warn_or_block_dirty_repo(allowed_paths: List[Path], status_lines: Optional[List[str]] = None) -> None:
     """
     No más error “molesto”: si hay cambios fuera del publish, avisamos y preguntamos.
     Además: comparamos repo-relative (git status) vs allowed relativo.
     """
-    root = repo_root().resolve()
+    root = REPO_ROOT
 
     allowed = set()
     for p in allowed_paths:
@@ -398,8 +570,11 @@ def warn_or_block_dirty_repo(allowed_paths: List[Path]) -> None:
         except Exception:
             allowed.add(str(p).replace("\\", "/").lstrip("./"))
 
+    if status_lines is None:
+        status_lines = git_status_porcelain()
+
     bad: List[str] = []
-    for ln in git_status_porcelain():
+    for ln in status_lines:
         path = ln[3:].strip()
         if " -> " in path:
             path = path.split(" -> ", 1)[1].strip()
@@ -422,53 +597,60 @@ def main() -> int:
     try:
         run_preflight()
 
-        if len(sys.argv) != 2:
-            eprintln("Uso: qcambiar YYYY-MM-DD")
+        args = sys.argv[1:]
+        # --local: publicar el .txt ya editado localmente, sin pull de Google Docs
+        local_only = "--local" in args
+        args = [a for a in args if a != "--local"]
+        if len(args) != 1:
+            eprintln("Uso: qcambiar YYYY-MM-DD [--local]")
             return 1
 
-        date_str = sys.argv[1]
+        date_str = args[0]
         parse_yyyy_mm_dd(date_str)
 
-        archivo = load_archivo_json()
-        entry = find_entry_by_date(archivo, date_str)
+        # Lectura local y barata: confirmar la entrada antes de tocar la red / OAuth
+        entry = load_entry_by_date(date_str)
         if not entry:
             eprintln(f"[qcambiar] No existe entrada publicada para {date_str}. Usa qcrear.")
             return 1
 
+        # El pull (red) arranca ya; el .txt se lee en paralelo
+        pulled_future = None if local_only else start_gdocs_pull(date_str)
+
         txt_path = txt_path_for_date(date_str)
         current_payload = read_current_payload(date_str, txt_path)
-        existing_fp = txt_fingerprint_from_file(txt_path)
+        # Mismo resultado que txt_fingerprint_from_file, sin volver a leer el .txt
+        existing_fp = docs_fingerprint(
+            current_payload["poema"],
+            current_payload["poema_citado"],
+            current_payload["texto"],
+        ) if txt_path.exists() else None
 
         println(SEP)
         println(f"[qcambiar] OK: entrada publicada encontrada para {date_str}.")
         println("")
-        println("[qcambiar] Haciendo pull desde Google Docs para comparar…")
-
-        try:
-            poem_pull = run_py_json("scripts/gdocs/gdocs_pull_poem_by_date.py", ["--date", date_str])
-        except Exception as e:
-            raise RuntimeError(f"Fallo pull de POEMA (Google Docs) para {date_str}: {e}") from e
-
-        try:
-            analysis_pull = run_py_json("scripts/gdocs/gdocs_pull_analysis_by_date.py", ["--date", date_str])
-        except Exception as e:
-            raise RuntimeError(f"Fallo pull de ANÁLISIS (Google Docs) para {date_str}: {e}") from e
-
-        pulled_raw: Dict[str, Any] = {}
-        pulled_raw.update(poem_pull or {})
-        pulled_raw.update(analysis_pull or {})
-        pulled = normalize_pulled_payload(pulled_raw)
-
-        for k in DATE_KEYS + SECTION_KEYS:
-            pulled.setdefault(k, "")
-
-        P_changed, A_changed, report_lines = compute_diff_report(current_payload, pulled)
+        if local_only:
+            println("[qcambiar] --local: sin pull de Google Docs; comparo el .txt local contra HEAD…")
+            P_changed, A_changed, report_lines = compute_diff_report(
+                read_head_payload(date_str, txt_path), current_payload
+            )
+        else:
+            println("[qcambiar] Haciendo pull desde Google Docs para comparar…")
+            pulled = pulled_future.result()
+            P_changed, A_changed, report_lines = compute_diff_report(current_payload, pulled)
         P_for_msg = P_changed
         A_for_msg = A_changed
 
         # Mensaje INMEDIATO después del pull
         println("")
-        if P_changed or A_changed:
+        if local_only:
+            if P_changed or A_changed:
+                println("[qcambiar] ⚠️ Cambios locales detectados (.txt ≠ HEAD):")
+                for ln in report_lines:
+                    println(ln)
+            else:
+                println("[qcambiar] ✅ El .txt local coincide con HEAD (sin diferencias).")
+        elif P_changed or A_changed:
             println("[qcambiar] ⚠️ Cambios detectados (Google Docs ≠ publicado):")
             for ln in report_lines:
                 println(ln)
@@ -482,8 +664,11 @@ def main() -> int:
 
         txt_changed = False
 
-        # Aplicación de cambios SOLO si hay diferencias
-        if P_changed or A_changed:
+        if local_only:
+            # El .txt ya es el contenido final; solo importa si git lo ve cambiado
+            txt_changed = git_file_has_diff(txt_path)
+        elif P_changed or A_changed:
+            # Aplicación de cambios SOLO si hay diferencias
             println("")
             if prompt_yn("[qcambiar] ¿Aplicar estos cambios al .txt publicado?", default_yes=False):
                 final_payload = dict(current_payload)
@@ -498,15 +683,21 @@ def main() -> int:
                     return 0
 
                 new_txt = render_txt(date_str, final_payload)
-                write_text_atomic(txt_path, new_txt)
-                println(f"[qcambiar] ✅ Escribí build output: {txt_path}")
-
-                new_fp = txt_fingerprint_from_file(txt_path)
-                txt_changed = (
-                    (existing_fp is None and new_fp is not None)
-                    or (existing_fp != new_fp)
-                    or git_file_has_diff(txt_path)
-                )
+                old_bytes = txt_path.read_bytes() if txt_path.exists() else None
+                if old_bytes == new_txt.encode("utf-8"):
+                    # Render idéntico byte a byte: no reescribir (ni tocar mtime)
+                    println(f"[qcambiar] ℹ️  El .txt renderizado es idéntico al actual; no lo reescribo: {txt_path}")
+                    txt_changed = git_file_has_diff(txt_path)
+                else:
+                    write_text_atomic(txt_path, new_txt)
+                    println(f"[qcambiar] ✅ Escribí build output: {txt_path}")
+
+                    new_fp = txt_fingerprint_from_file(txt_path)
+                    txt_changed = (
+                        (existing_fp is None and new_fp is not None)
+                        or (existing_fp != new_fp)
+                        or git_file_has_diff(txt_path)
+                    )
             else:
                 println("[qcambiar] OK. No se aplicaron cambios de texto.")
 
@@ -534,30 +725,13 @@ def main() -> int:
 
         # Regenerar
         if prompt_yn("[qcambiar] ¿Quieres regenerar keywords?", default_yes=False):
-            if pending_obj and (pending_obj.get("date") or pending_obj.get("keywords")):
-                if not prompt_yn("[qcambiar] Ya hay pending_keywords.txt con contenido. ¿Reemplazarlo?", default_yes=False):
-                    println("[qcambiar] OK. No regeneré keywords.")
-                else:
-                    kws = generate_keywords_from_txt(txt_path)
-                    fp = txt_fingerprint_from_file(txt_path) or docs_fingerprint(
-                        current_payload.get("poema", ""),
-                        current_payload.get("poema_citado", ""),
-                        current_payload.get("texto", ""),
-                    )
-                    write_pending_keywords(date_str, kws, fp)
-                    pending_obj = load_pending_keywords()
-                    regenerated = True
-                    apply_keywords = True
-                    println("[qcambiar] ✅ Regeneré keywords → pending_keywords.txt actualizado.")
+            has_pending = bool(pending_obj and (pending_obj.get("date") or pending_obj.get("keywords")))
+            if has_pending and not prompt_yn(
+                "[qcambiar] Ya hay pending_keywords.txt con contenido. ¿Reemplazarlo?", default_yes=False
+            ):
+                println("[qcambiar] OK. No regeneré keywords.")
             else:
-                kws = generate_keywords_from_txt(txt_path)
-                fp = txt_fingerprint_from_file(txt_path) or docs_fingerprint(
-                    current_payload.get("poema", ""),
-                    current_payload.get("poema_citado", ""),
-                    current_payload.get("texto", ""),
-                )
-                write_pending_keywords(date_str, kws, fp)
-                pending_obj = load_pending_keywords()
+                pending_obj = regenerate_pending_keywords(date_str, txt_path, current_payload)
                 regenerated = True
                 apply_keywords = True
                 println("[qcambiar] ✅ Regeneré keywords → pending_keywords.txt actualizado.")
@@ -585,7 +759,7 @@ def main() -> int:
             println("[qcambiar] OK. No se publicó nada.")
             return 0
 
-        branch = git(["rev-parse", "--abbrev-ref", "HEAD"])
+        branch, status_lines = git_branch_and_status()
         if branch != "main":
             println(f"[qcambiar] ⚠️  Estás en branch '{branch}', no en main.")
             if not prompt_yn("[qcambiar] ¿Continuar de todos modos?", default_yes=False):
@@ -601,7 +775,7 @@ def main() -> int:
 
         # Avisar si repo sucio (pero no bloquear con error molesto)
         allowed = [txt_path, archivo_path(), pending_entry_path(), pending_kw_path()]
-        warn_or_block_dirty_repo(allowed)
+        warn_or_block_dirty_repo(allowed, status_lines)
 
         # merge_pending (actualiza archivo.json + pending_entry.json; keywords opcional)
         mp_args = [
@@ -618,13 +792,16 @@ def main() -> int:
         # Cleanup staging files ANTES del commit (como qcrear)
         reset_pending_files()
 
-        # Stage + commit + push
-        git(["add", str(txt_path)])
-        git(["add", str(archivo_path())])
-        git(["add", str(pending_entry_path())])
-        git(["add", str(pending_kw_path())])
+        # Stage + commit en un solo git: `commit --only <paths>` stagea y commitea
+        # exactamente los archivos del publish. --only exige paths conocidos por
+        # git, así que los untracked (raro: .txt nuevo) se añaden antes.
+        publish_paths = [txt_path, archivo_path(), pending_entry_path(), pending_kw_path()]
+        untracked = {ln[3:] for ln in status_lines if ln.startswith("?? ")}
+        new_paths = [str(p) for p in publish_paths if p.relative_to(REPO_ROOT).as_posix() in untracked]
+        if new_paths:
+            git(["add", "--", *new_paths])
 
-        git(["commit", "-m", commit_msg])
+        git(["commit", "--only", "-m", commit_msg, "--", *(str(p) for p in publish_paths)])
         git(["push", "origin", branch])
 
         println(f"✅ Publicado: {commit_msg}")
@@ -3,7 +3,7 @@ set -euo pipefail
 
 # qcambiar.sh — wrapper para qcambiar.py
 # Uso:
-#   ./scripts/qcambiar.sh YYYY-MM-DD
+#   ./scripts/qcambiar.sh YYYY-MM-DD [--local]
 
 SCRIPT_DIR="$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" >/dev/null 2>&1 && pwd)"
 REPO_ROOT="$(cd -- "${SCRIPT_DIR}/.." >/dev/null 2>&1 && pwd)"
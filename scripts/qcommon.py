@@ -9,9 +9,15 @@ import subprocess
 import sys
 from dataclasses import dataclass
 from datetime import date
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
+try:  # opcional: mismo resultado, parse/serialize más rápido si está instalado
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 
 # -----------------------------
 # UI helpers
@@ -78,25 +84,59 @@ def prompt_choice(question: str, choices: list[str], default: Optional[str] = No
         println(f"Responde con una de: {', '.join(choices)} (o 'salir').")
 
 
+# -----------------------------
+# JSON helpers (orjson si está, stdlib si no)
+# -----------------------------
+
+def json_loads(data: bytes | str) -> object:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj: object) -> str:
+    """Igual que json.dumps(obj, ensure_ascii=False, indent=2)."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def json_dumps_pretty_file(obj: object) -> bytes:
+    """
+    json_dumps_pretty(obj) + "\n" ya en UTF-8, listo para write_bytes: con orjson
+    se evita el decode/encode del str intermedio (archivo.json completo).
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
 # -----------------------------
 # Paths / repo detection
 # -----------------------------
 
+# Asumimos scripts/*.py, subimos 1 nivel (resuelto una vez al importar;
+# Path es inmutable, así que se devuelven siempre los mismos objetos)
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_DATA_DIR = _REPO_ROOT / "data"
+_ARCHIVO_JSON = _DATA_DIR / "archivo.json"
+_STATE_DIR = _REPO_ROOT / "state"
+
+
 def repo_root() -> Path:
-    # Asumimos scripts/*.py, subimos 1 nivel
-    return Path(__file__).resolve().parent.parent
+    return _REPO_ROOT
 
 
 def data_dir() -> Path:
-    return repo_root() / "data"
+    return _DATA_DIR
 
 
 def archivo_json_path() -> Path:
-    return data_dir() / "archivo.json"
+    return _ARCHIVO_JSON
 
 
 def state_dir() -> Path:
-    return repo_root() / "state"
+    return _STATE_DIR
 
 
 @dataclass(frozen=True)
@@ -122,20 +162,19 @@ def run_preflight() -> Preflight:
 # Date helpers
 # -----------------------------
 
-DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 
 def parse_yyyy_mm_dd(s: str) -> date:
-    if not DATE_RE.match(s):
+    # DATE_RE fija la forma (fromisoformat también acepta 20240105 o 2024-W01-1);
+    # fromisoformat valida la fecha en C y rechaza dígitos no ASCII
+    if not DATE_RE.fullmatch(s):
         raise ValueError("Formato inválido, usa YYYY-MM-DD.")
-    y, m, d = map(int, s.split("-"))
-    return date(y, m, d)
+    return date.fromisoformat(s)
 
 
 def load_archivo_json() -> object:
-    p = archivo_json_path()
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_loads(archivo_json_path().read_bytes())
 
 
 def entries_list_from_archivo(archivo: object) -> list[dict]:
@@ -163,28 +202,66 @@ def find_entry_by_date(archivo: object, target: str) -> Optional[dict]:
     return None
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def load_entry_by_date(target: str) -> Optional[dict]:
+    """
+    Busca UNA entry sin parsear todo archivo.json: localiza '{ "date": "<target>"'
+    y decodifica solo ese objeto (JSONDecoder.raw_decode desde esa posición).
+    Dentro de un string JSON las comillas van escapadas, así que el patrón solo
+    puede caer en un objeto real. Si no aparece (no existe, u otro formato),
+    cae al parse completo + find_entry_by_date.
+    """
+    raw = archivo_json_path().read_text(encoding="utf-8")
+    m = re.search(r'\{\s*"date"\s*:\s*"' + re.escape(target) + '"', raw)
+    if m is not None:
+        try:
+            obj, _end = _JSON_DECODER.raw_decode(raw, m.start())
+        except json.JSONDecodeError:
+            obj = None
+        if isinstance(obj, dict) and obj.get("date") == target:
+            return obj
+    return find_entry_by_date(load_archivo_json(), target)
+
+
 # -----------------------------
 # Hash / fingerprint helpers
 # -----------------------------
 
 def normalize_text_for_hash(s: str) -> str:
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    lines = [ln.rstrip() for ln in s.split("\n")]
-    while lines and lines[0].strip() == "":
-        lines.pop(0)
-    while lines and lines[-1].strip() == "":
-        lines.pop()
-    return "\n".join(lines)
+    # Sin splitlines(): también corta en \v, \f, \x1c-\x1e, \x85, \u2028/9
+    # y cambiaría los fingerprints. Casi nunca hay \r: solo entonces los replace.
+    if "\r" in s:
+        s = s.replace("\r\n", "\n").replace("\r", "\n")
+    # Tras el rstrip por línea, los vacíos extremos son solo "\n" sobrantes:
+    # strip("\n") sobre el join los quita sin los pop(0) cuadráticos.
+    return "\n".join([ln.rstrip() for ln in s.split("\n")]).strip("\n")
+
+
+_FP_SEP = "\n\n---\n\n".encode("utf-8")
+
+
+def docs_fingerprint_from_normalized(poem_n: str, citado_n: str, texto_n: str) -> str:
+    """
+    docs_fingerprint sobre secciones YA normalizadas (cada script con su
+    normalize_text_for_hash). Mismo hash que sha256 del payload unido por
+    "\n\n---\n\n", pero alimentado por partes sin armar el payload completo.
+    """
+    h = hashlib.sha256(poem_n.encode("utf-8"))
+    h.update(_FP_SEP)
+    h.update(citado_n.encode("utf-8"))
+    h.update(_FP_SEP)
+    h.update(texto_n.encode("utf-8"))
+    return f"sha256:{h.hexdigest()}"
 
 
 def docs_fingerprint(poem: str, poem_citado: str, texto: str) -> str:
-    payload = "\n\n---\n\n".join([
+    return docs_fingerprint_from_normalized(
         normalize_text_for_hash(poem),
         normalize_text_for_hash(poem_citado),
         normalize_text_for_hash(texto),
-    ])
-    h = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{h}"
+    )
 
 
 def extract_section(txt: str, header: str) -> str:
@@ -202,16 +279,39 @@ def extract_section(txt: str, header: str) -> str:
     return "\n".join(out)
 
 
+def extract_sections(txt: str, headers: tuple[str, ...]) -> dict[str, str]:
+    """
+    extract_section para varios headers en una sola pasada (un solo split):
+    misma semántica, primera línea == header hasta el siguiente '# ' o EOF;
+    header ausente => "".
+    """
+    if "\r" in txt:
+        txt = txt.replace("\r\n", "\n").replace("\r", "\n")
+    found: dict[str, list[str]] = {}
+    cur: Optional[list[str]] = None
+    for ln in txt.split("\n"):
+        if ln.startswith("# "):
+            cur = None
+            if ln in headers and ln not in found:
+                cur = found[ln] = []
+        elif cur is not None:
+            cur.append(ln)
+    return {h: "\n".join(found.get(h, ())) for h in headers}
+
+
+_FP_HEADERS = ("# POEMA", "# POEMA_CITADO", "# TEXTO")
+
+
 def txt_fingerprint_from_file(path: Path) -> Optional[str]:
     if not path.exists():
         return None
     raw = path.read_text(encoding="utf-8")
-    poema = extract_section(raw, "# POEMA")
-    citado = extract_section(raw, "# POEMA_CITADO")
-    texto = extract_section(raw, "# TEXTO")
-    if normalize_text_for_hash(poema) == "" or normalize_text_for_hash(citado) == "" or normalize_text_for_hash(texto) == "":
+    sections = extract_sections(raw, _FP_HEADERS)
+    # Cada sección se normaliza una sola vez (chequeo de vacío + hash)
+    poema_n, citado_n, texto_n = (normalize_text_for_hash(sections[h]) for h in _FP_HEADERS)
+    if poema_n == "" or citado_n == "" or texto_n == "":
         return None
-    return docs_fingerprint(poema, citado, texto)
+    return docs_fingerprint_from_normalized(poema_n, citado_n, texto_n)
 
 
 # -----------------------------
@@ -224,49 +324,54 @@ def run_py_json(script_relpath: str, args: list[str]) -> dict:
         raise RuntimeError(f"No encuentro {script_relpath} en el repo.")
 
     cmd = [sys.executable, str(script_path), *args]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # bytes: json_loads parsea UTF-8 directo; solo se decodifica para mensajes de error
+    proc = subprocess.run(cmd, capture_output=True)
 
     if proc.returncode != 0:
-        stderr = (proc.stderr or "").strip()
-        stdout = (proc.stdout or "").strip()
+        stderr = (proc.stderr or b"").decode("utf-8", "replace").strip()
+        stdout = (proc.stdout or b"").decode("utf-8", "replace").strip()
         msg = stderr or stdout or f"Falló: {' '.join(cmd)}"
         raise RuntimeError(msg)
 
-    out = (proc.stdout or "").strip()
+    out = (proc.stdout or b"").strip()
 
     # Caso A: stdout ES JSON puro
     try:
-        return json.loads(out) if out else {}
+        return json_loads(out) if out else {}
     except Exception:
         pass
 
     # Caso B: logs + línea final STATUS_JSON={...}
     for line in reversed(out.splitlines()):
         line = line.strip()
-        if line.startswith("STATUS_JSON="):
-            payload = line.split("=", 1)[1].strip()
+        if line.startswith(b"STATUS_JSON="):
+            payload = line.split(b"=", 1)[1].strip()
             try:
-                obj = json.loads(payload)
+                obj = json_loads(payload)
             except Exception as e:
                 raise RuntimeError(
-                    f"STATUS_JSON inválido ({script_relpath}): {e}\n\nLINE:\n{line}\n\nSTDOUT:\n{out}"
+                    f"STATUS_JSON inválido ({script_relpath}): {e}\n\n"
+                    f"LINE:\n{line.decode('utf-8', 'replace')}\n\nSTDOUT:\n{out.decode('utf-8', 'replace')}"
                 )
             # tu run_py_json anuncia que devuelve dict
             if isinstance(obj, dict):
                 return obj
             raise RuntimeError(
-                f"STATUS_JSON no devolvió dict ({script_relpath}). Tipo={type(obj)}\n\nLINE:\n{line}"
+                f"STATUS_JSON no devolvió dict ({script_relpath}). Tipo={type(obj)}\n\n"
+                f"LINE:\n{line.decode('utf-8', 'replace')}"
             )
 
     # Si llegamos aquí: no era JSON y tampoco hubo STATUS_JSON=
-    raise RuntimeError(f"stdout no es JSON ({script_relpath}).\n\nSTDOUT:\n{out}")
+    raise RuntimeError(f"stdout no es JSON ({script_relpath}).\n\nSTDOUT:\n{out.decode('utf-8', 'replace')}")
 
 
 
-def write_text_atomic(path: Path, content: str) -> None:
+def write_text_atomic(path: Path, content: str | bytes) -> None:
+    # str se codifica una vez a UTF-8; bytes se escriben tal cual
+    data = content.encode("utf-8") if isinstance(content, str) else content
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content, encoding="utf-8")
+    tmp.write_bytes(data)
     tmp.replace(path)
 
 
@@ -274,33 +379,61 @@ def write_text_atomic(path: Path, content: str) -> None:
 # Git helpers
 # -----------------------------
 
+# GIT_OPTIONAL_LOCKS=0: status/diff no reescriben el index (ni toman su lock)
+_GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
 def git(cmd: list[str]) -> str:
-    proc = subprocess.run(["git", *cmd], capture_output=True, text=True)
+    # bytes + un solo decode al final (sin la capa de texto de subprocess)
+    proc = subprocess.run(["git", *cmd], capture_output=True, env=_GIT_ENV)
     if proc.returncode != 0:
-        raise RuntimeError((proc.stderr or proc.stdout or "").strip() or f"git {' '.join(cmd)} falló")
-    return (proc.stdout or "").strip()
+        msg = (proc.stderr or proc.stdout or b"").decode("utf-8", "replace").strip()
+        raise RuntimeError(msg or f"git {' '.join(cmd)} falló")
+    return (proc.stdout or b"").decode("utf-8", "replace").strip()
 
 
 # -----------------------------
 # archivo.json apply helper
 # -----------------------------
 
+_MISSING = object()
+_DATE_KEY = itemgetter("date")
+
+
 def apply_pending_entry_into_archivo(date_str: str, pending_entry_path: Path, archivo_path: Path) -> None:
-    pending = json.loads(pending_entry_path.read_text(encoding="utf-8"))
+    """
+    Inserta/reemplaza entry por fecha en archivo.json y ordena desc por date.
+    """
+    pending = json_loads(pending_entry_path.read_bytes())
     if not isinstance(pending, dict) or pending.get("date") != date_str:
         raise RuntimeError("pending_entry.json inválido o fecha no coincide")
 
-    data = json.loads(archivo_path.read_text(encoding="utf-8"))
+    raw = archivo_path.read_bytes()
+    data = json_loads(raw)
     entries = data.get("entries") if isinstance(data, dict) else data
     if not isinstance(entries, list):
         raise RuntimeError("archivo.json inválido: raíz no es lista ni {'entries': [...]}")
 
-    entries = [e for e in entries if isinstance(e, dict) and e.get("date") != date_str]
-    entries.append(pending)
-    entries.sort(key=lambda e: e.get("date", ""), reverse=True)
-
-    # mantener formato histórico (lista)
-    archivo_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    kept: list = []
+    all_dated = True  # ¿todas las entries traen "date"? (itemgetter no tolera que falte)
+    for e in entries:
+        if isinstance(e, dict):
+            d = e.get("date", _MISSING)
+            if d != date_str:
+                kept.append(e)
+                if d is _MISSING:
+                    all_dated = False
+    kept.append(pending)
+    # itemgetter es un getter en C (sin frame Python por elemento como la lambda)
+    kept.sort(key=_DATE_KEY if all_dated else (lambda e: e.get("date", "")), reverse=True)
+    entries = kept
+
+    # Mantener formato histórico (lista) como en qmp_publish.sh.
+    # Si el resultado es idéntico (re-run sin cambios) no se reescribe: el mtime
+    # queda intacto
+    out = json_dumps_pretty_file(entries)
+    if out != raw:
+        write_text_atomic(archivo_path, out)
 
 
 # -----------------------------
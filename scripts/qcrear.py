@@ -2,13 +2,46 @@
 from __future__ import annotations
 
 import json
-import os
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional
+
+# Ensure scripts/ is importable
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Helpers compartidos con qcambiar (mismo comportamiento). Se quedan aquí los que
+# difieren: prompt_yn (modo --auto), run_preflight (no crea state/),
+# normalize_text_for_hash/docs_fingerprint (quitan invisibles: fingerprints
+# de qcrear), run_py_json (pulls en el mismo proceso).
+from qcommon import (  # type: ignore
+    SEP,
+    println,
+    eprintln,
+    is_exit_token,
+    UserAbort,
+    repo_root,
+    data_dir,
+    archivo_json_path,
+    state_dir,
+    Preflight,
+    DATE_RE,
+    parse_yyyy_mm_dd,
+    json_loads,
+    json_dumps_pretty,
+    json_dumps_pretty_file,
+    extract_sections,
+    docs_fingerprint_from_normalized,
+    write_text_atomic as write_txt_atomic,
+    git,
+    apply_pending_entry_into_archivo,
+    load_archivo_json,
+)
 
 AUTO = "--auto" in sys.argv
 DRY_RUN = "--dry-run" in sys.argv
@@ -21,24 +54,6 @@ SWEEP = "--sweep" in sys.argv
 # UI helpers
 # -----------------------------
 
-SEP = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-
-
-def println(msg: str = "") -> None:
-    sys.stdout.write(msg + "\n")
-    sys.stdout.flush()
-
-
-def eprintln(msg: str = "") -> None:
-    sys.stderr.write(msg + "\n")
-    sys.stderr.flush()
-
-
-def is_exit_token(s: str) -> bool:
-    s = s.strip().lower()
-    return s in {"salir", "q", "quit", "exit"}
-
-
 def prompt_yn(question: str, default_yes: bool = False) -> bool:
     """
     Pregunta y/N o Y/n. Acepta 'salir' en cualquier momento.
@@ -66,39 +81,10 @@ def prompt_yn(question: str, default_yes: bool = False) -> bool:
 
 
 
-class UserAbort(Exception):
-    pass
-
-
 # -----------------------------
 # Paths / repo detection
 # -----------------------------
 
-def repo_root() -> Path:
-    # Asumimos scripts/qcrear.py, subimos 1 nivel
-    return Path(__file__).resolve().parent.parent
-
-
-def data_dir() -> Path:
-    return repo_root() / "data"
-
-
-def archivo_json_path() -> Path:
-    return data_dir() / "archivo.json"
-
-
-def state_dir() -> Path:
-    return repo_root() / "state"
-
-
-@dataclass(frozen=True)
-class Preflight:
-    repo: Path
-    archivo_json: Path
-    ok_repo: bool
-    ok_archivo_json: bool
-
-
 @dataclass
 class PublishResult:
     target: str
@@ -125,44 +111,96 @@ def run_preflight() -> Preflight:
 # Date helpers
 # -----------------------------
 
-DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# archivo.json se lee una vez por corrida (main / run_sweep) y el objeto se
+# pasa a choose_target_date y publish_one_date.
 
+def _top_level_entries(archivo: object) -> Optional[list]:
+    """
+    Lista de entries si archivo.json tiene la forma conocida (lista o
+    {"entries": [...]}); None si la estructura es otra.
+    """
+    if isinstance(archivo, list):
+        return archivo
+    if isinstance(archivo, dict) and isinstance(archivo.get("entries"), list):
+        return archivo["entries"]
+    return None
 
-def parse_yyyy_mm_dd(s: str) -> date:
-    if not DATE_RE.match(s):
-        raise ValueError("Formato inválido, usa YYYY-MM-DD.")
-    y, m, d = map(int, s.split("-"))
-    return date(y, m, d)
 
+def _entry_dates(archivo: object) -> Optional[list[str]]:
+    """Los "date" (str) de las entries, o None si la forma no es la conocida."""
+    entries = _top_level_entries(archivo)
+    if entries is None:
+        return None
+    dates: list[str] = []
+    for e in entries:
+        if isinstance(e, dict):
+            d = e.get("date")
+            if isinstance(d, str):
+                dates.append(d)
+    return dates
+
+
+def _walk_dates(archivo: object) -> list[str]:
+    """Recorrido tolerante: cualquier campo 'date' (str) en cualquier nivel."""
+    dates: list[str] = []
+    stack = [archivo]
+    # type() is en vez de isinstance: el JSON parseado solo trae dict/list/str exactos
+    while stack:
+        obj = stack.pop()
+        t = type(obj)
+        if t is dict:
+            d = obj.get("date")
+            if type(d) is str:
+                dates.append(d)
+            stack.extend(obj.values())
+        elif t is list:
+            stack.extend(obj)
+    return dates
 
-def load_archivo_json() -> dict:
-    p = archivo_json_path()
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
 
 def date_exists_in_archivo(archivo: dict, target: str) -> bool:
     """
-    True si existe un objeto con {"date": target} en cualquier parte del JSON.
-    Tolerante a estructura: busca recursivamente.
+    True si existe un objeto con {"date": target}.
+    Con la forma conocida solo mira el "date" de cada entry (las fechas viven ahí);
+    si la estructura es otra, busca recursivamente en todo el JSON.
     """
-    found = False
-
-    def walk(obj):
-        nonlocal found
-        if found:
-            return
-        if isinstance(obj, dict):
-            if obj.get("date") == target:
-                found = True
-                return
-            for v in obj.values():
-                walk(v)
-        elif isinstance(obj, list):
-            for it in obj:
-                walk(it)
+    dates = _entry_dates(archivo)
+    if dates is None:
+        dates = _walk_dates(archivo)
+    return target in dates
 
-    walk(archivo)
-    return found
+
+def _max_valid_date(dates: list[str]) -> Optional[date]:
+    # YYYY-MM-DD ordena lexicográficamente: max sobre los str y solo se parsea la ganadora
+    if not dates:
+        return None
+    try:
+        return parse_yyyy_mm_dd(max(dates))
+    except ValueError:
+        pass
+    # La máxima no sirve (formato raro o p.ej. 2024-02-30): se parsean todas
+    best: Optional[date] = None
+    for d in dates:
+        try:
+            v = parse_yyyy_mm_dd(d)
+        except ValueError:
+            continue
+        if best is None or v > best:
+            best = v
+    return best
+
+
+def _max_date_in_archivo(archivo: object) -> Optional[date]:
+    """
+    Fecha máxima de archivo.json. Con la forma conocida solo mira el "date" de
+    cada entry; si no sale nada, recorre todo el JSON.
+    """
+    dates = _entry_dates(archivo)
+    if dates is not None:
+        found = _max_valid_date(dates)
+        if found is not None:
+            return found
+    return _max_valid_date(_walk_dates(archivo))
 
 
 def get_next_date_from_archivo(archivo: dict) -> Optional[str]:
@@ -173,28 +211,10 @@ def get_next_date_from_archivo(archivo: dict) -> Optional[str]:
 
     Esto es scaffold: lo refinamos cuando integremos tu schema exacto.
     """
-    dates: list[date] = []
-    # Buscamos cualquier campo 'date' al nivel de items en listas comunes
-    # (muy tolerante).
-    def walk(obj):
-        if isinstance(obj, dict):
-            if "date" in obj and isinstance(obj["date"], str) and DATE_RE.match(obj["date"]):
-                try:
-                    dates.append(parse_yyyy_mm_dd(obj["date"]))
-                except Exception:
-                    pass
-            for v in obj.values():
-                walk(v)
-        elif isinstance(obj, list):
-            for it in obj:
-                walk(it)
-
-    walk(archivo)
-
-    if not dates:
+    last = _max_date_in_archivo(archivo)
+    if last is None:
         return None
 
-    last = max(dates)
     nxt = last.toordinal() + 1
     return date.fromordinal(nxt).isoformat()
 
@@ -204,35 +224,20 @@ def latest_date_in_archivo(archivo: dict) -> Optional[date]:
     Devuelve la fecha máxima encontrada en archivo.json (campo "date").
     Soporta raíz lista o {"entries":[...]}.
     """
-    # Re-usa tu walk tolerante
-    dates: list[date] = []
-
-    def walk(obj):
-        if isinstance(obj, dict):
-            if isinstance(obj.get("date"), str) and DATE_RE.match(obj["date"]):
-                try:
-                    dates.append(parse_yyyy_mm_dd(obj["date"]))
-                except Exception:
-                    pass
-            for v in obj.values():
-                walk(v)
-        elif isinstance(obj, list):
-            for it in obj:
-                walk(it)
-
-    walk(archivo)
-    return max(dates) if dates else None
-    
+    return _max_date_in_archivo(archivo)
+
+
+@lru_cache(maxsize=None)
 def txt_path_for_date(target: str) -> Path:
-    y, m, _ = target.split("-")
-    return data_dir() / "textos" / y / m / f"{target}.txt"
+    # target ya validado como YYYY-MM-DD: año y mes por posición
+    return data_dir() / "textos" / target[:4] / target[5:7] / f"{target}.txt"
 
 
 def txt_exists_for_date(target: str) -> bool:
     return txt_path_for_date(target).exists()
 
 
-def choose_target_date(argv: list[str]) -> str:
+def choose_target_date(argv: list[str], archivo: object) -> str:
     if len(argv) >= 2:
         # argv[0] es el script
         s = argv[1].strip()
@@ -242,7 +247,6 @@ def choose_target_date(argv: list[str]) -> str:
         return s
 
     # no date provided: propose NEXT_DATE from archivo.json
-    archivo = load_archivo_json()
     nxt = get_next_date_from_archivo(archivo)
 
     if nxt is None:
@@ -265,31 +269,77 @@ def choose_target_date(argv: list[str]) -> str:
         raise UserAbort()
     return nxt
 import subprocess
-import hashlib
+import importlib.util
+
+# Scripts que exponen fetch(date) -> dict (mismo JSON que imprimen): con
+# ["--date", X] se llaman en este proceso, sin arrancar otro intérprete.
+_INPROC_FETCH_SCRIPTS = frozenset({
+    "scripts/gdocs/gdocs_pull_poem_by_date.py",
+    "scripts/gdocs/gdocs_pull_analysis_by_date.py",
+})
+_INPROC_MODULES: dict = {}
+
+
+def _inproc_fetch(script_relpath: str):
+    """
+    fetch() del script (importado una sola vez), o None si no se puede importar
+    (p.ej. falta googleapiclient): entonces run_py_json usa el subprocess.
+    """
+    if script_relpath in _INPROC_MODULES:
+        mod = _INPROC_MODULES[script_relpath]
+        return getattr(mod, "fetch", None) if mod is not None else None
+
+    script_path = repo_root() / script_relpath
+    mod = None
+    try:
+        # los scripts de gdocs importan _gdocs_auth como módulo hermano
+        script_dir = str(script_path.parent)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        spec = importlib.util.spec_from_file_location(f"_qmp_{script_path.stem}", script_path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    except Exception:
+        mod = None
+    _INPROC_MODULES[script_relpath] = mod
+    return getattr(mod, "fetch", None) if mod is not None else None
+
 
 def run_py_json(script_relpath: str, args: list[str]) -> dict:
     """
     Ejecuta un script python del repo y parsea stdout como JSON.
     Aborta con error claro si el script falla o si stdout no es JSON.
+    Los pulls de gdocs se llaman en el mismo proceso (ver _INPROC_FETCH_SCRIPTS).
     """
+    if script_relpath in _INPROC_FETCH_SCRIPTS and len(args) == 2 and args[0] == "--date":
+        fetch = _inproc_fetch(script_relpath)
+        if fetch is not None:
+            try:
+                return fetch(args[1])
+            except Exception as e:
+                raise RuntimeError(f"Falló {script_relpath}: {e}") from e
+
     script_path = repo_root() / script_relpath
     if not script_path.exists():
         raise RuntimeError(f"No encuentro {script_relpath} en el repo.")
 
     cmd = [sys.executable, str(script_path), *args]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # bytes: json_loads parsea UTF-8 directo; solo se decodifica para mensajes de error
+    proc = subprocess.run(cmd, capture_output=True)
 
     if proc.returncode != 0:
-        stderr = (proc.stderr or "").strip()
-        stdout = (proc.stdout or "").strip()
+        stderr = (proc.stderr or b"").decode("utf-8", "replace").strip()
+        stdout = (proc.stdout or b"").decode("utf-8", "replace").strip()
         msg = stderr or stdout or f"Exit code {proc.returncode}"
         raise RuntimeError(f"Falló {script_relpath}: {msg}")
 
-    out = (proc.stdout or "").strip()
+    out = (proc.stdout or b"").strip()
     try:
-        return json.loads(out)
-    except json.JSONDecodeError:
-        raise RuntimeError(f"{script_relpath} no devolvió JSON válido. Stdout:\n{out}")
+        return json_loads(out)
+    except ValueError:
+        out_s = out.decode("utf-8", "replace")
+        raise RuntimeError(f"{script_relpath} no devolvió JSON válido. Stdout:\n{out_s}")
+
 def normalize_text_for_hash(s: str) -> str:
     # Normalización estable:
     # - newlines
@@ -301,69 +351,61 @@ def normalize_text_for_hash(s: str) -> str:
     # invisibles que suelen aparecer como "línea vacía" en la consola/preview
     for ch in ("\u200b", "\ufeff", "\u2060"):
         s = s.replace(ch, "")
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    lines = [ln.rstrip() for ln in s.split("\n")]
-    # quitar vacíos extremos
-    while lines and lines[0].strip() == "":
-        lines.pop(0)
-    while lines and lines[-1].strip() == "":
-        lines.pop()
-    return "\n".join(lines)
+    # Casi nunca hay \r (los .txt y los pulls ya vienen con \n): un solo scan
+    # en vez de dos replace completos
+    if "\r" in s:
+        s = s.replace("\r\n", "\n").replace("\r", "\n")
+    # Tras el rstrip por línea, los vacíos extremos son solo "\n" sobrantes:
+    # strip("\n") sobre el join los quita sin los pop(0) cuadráticos.
+    return "\n".join([ln.rstrip() for ln in s.split("\n")]).strip("\n")
 
 def docs_fingerprint(poem: str, poem_citado: str, texto: str) -> str:
-    payload = "\n\n---\n\n".join([
+    return docs_fingerprint_from_normalized(
         normalize_text_for_hash(poem),
         normalize_text_for_hash(poem_citado),
         normalize_text_for_hash(texto),
-    ])
-    h = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{h}"
-
-def extract_section(txt: str, header: str) -> str:
-    """
-    Extrae el contenido debajo de un header exacto ('# POEMA', etc.)
-    hasta el siguiente header '# ' o EOF.
-    """
-    txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-    lines = txt.split("\n")
+    )
 
-    try:
-        start = lines.index(header) + 1
-    except ValueError:
-        return ""
+_FP_HEADERS = ("# POEMA", "# POEMA_CITADO", "# TEXTO")
 
-    out = []
-    for ln in lines[start:]:
-        if ln.startswith("# "):
-            break
-        out.append(ln)
-    return "\n".join(out)
 
 def txt_fingerprint_from_file(path: Path) -> Optional[str]:
-    if not path.exists():
+    try:
+        raw = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         return None
-    raw = path.read_text(encoding="utf-8")
-    poema = extract_section(raw, "# POEMA")
-    citado = extract_section(raw, "# POEMA_CITADO")
-    texto = extract_section(raw, "# TEXTO")
+
+    # Cada sección se normaliza una sola vez (chequeo de vacío + hash)
+    sections = extract_sections(raw, _FP_HEADERS)
+    parts = [normalize_text_for_hash(sections[h]) for h in _FP_HEADERS]
 
     # si falta alguna sección, no confiamos
-    if normalize_text_for_hash(poema) == "" or normalize_text_for_hash(citado) == "" or normalize_text_for_hash(texto) == "":
+    if not all(parts):
         return None
 
-    return docs_fingerprint(poema, citado, texto)
+    return docs_fingerprint_from_normalized(*parts)
 
 
 def load_pending_keywords() -> Optional[dict]:
     p = state_dir() / "pending_keywords.txt"
-    if not p.exists():
+    # Un solo open (sin exists() previo); json_loads acepta bytes UTF-8 directo
+    try:
+        data = p.read_bytes()
+    except FileNotFoundError:
         return None
 
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
+        obj = json_loads(data)
     except Exception as e:
         raise RuntimeError(f"pending_keywords.txt inválido: {e}")
 
+    return validate_pending_keywords(obj)
+
+def validate_pending_keywords(obj: object) -> Optional[dict]:
+    """
+    Validación de load_pending_keywords sobre un objeto ya en memoria
+    (p.ej. el payload recién escrito por write_pending_keywords).
+    """
     if not isinstance(obj, dict):
         raise RuntimeError("pending_keywords.txt inválido: debe ser JSON objeto.")
 
@@ -375,7 +417,7 @@ def load_pending_keywords() -> Optional[dict]:
     if "date" not in obj or "keywords" not in obj:
         raise RuntimeError("pending_keywords.txt inválido: falta 'date' o 'keywords'.")
 
-    if not isinstance(obj["date"], str) or not DATE_RE.match(obj["date"]):
+    if not isinstance(obj["date"], str) or not DATE_RE.fullmatch(obj["date"]):
         raise RuntimeError("pending_keywords.txt inválido: 'date' debe ser YYYY-MM-DD.")
 
     if not isinstance(obj["keywords"], list):
@@ -400,7 +442,8 @@ def write_pending_keywords(
     target: str,
     keywords: list[dict],
     docs_fp: str,
-) -> None:
+) -> dict:
+    """Escribe pending_keywords.txt y devuelve el payload escrito."""
     p = state_dir() / "pending_keywords.txt"
     payload = {
         "date": target,
@@ -408,7 +451,8 @@ def write_pending_keywords(
         "keywords": keywords,
         "generated_at": datetime.now().isoformat(timespec="seconds"),
     }
-    p.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_txt_atomic(p, json_dumps_pretty(payload) + "\n")
+    return payload
 
 def top_keywords_preview(obj: dict, n: int = 10) -> list[tuple[str,int]]:
     kws = obj.get("keywords") or []
@@ -417,8 +461,8 @@ def top_keywords_preview(obj: dict, n: int = 10) -> list[tuple[str,int]]:
     pairs.sort(key=lambda x: (-x[1], x[0].lower()))
     return pairs[:n]
 
-def preview_block(name: str, text: str, n: int = 10) -> None:
-    lines = normalize_text_for_hash(text).splitlines()
+def preview_block(name: str, lines: list[str], n: int = 10) -> None:
+    # lines: splitlines() del texto ya normalizado (el resumen las reutiliza)
     println(f"— {name} (primeras {min(n, len(lines))} líneas de {len(lines)})")
     for ln in lines[:n]:
         println(f"  {ln}")
@@ -437,41 +481,29 @@ def render_txt(
     """
     Genera el archivo YYYY-MM-DD.txt completo como build output.
     Metadatos son opcionales pero siempre presentes.
-    Los 3 escritos son obligatorios y ya fueron validados antes.
+    Los 3 escritos son obligatorios y ya fueron validados antes; llegan ya
+    normalizados (normalize_text_for_hash) desde publish_one_date.
     """
     # Ojo: mantenemos los keys estilo máquina (como tu template actual).
     # Si luego quieres volver a "Poeta:"/"Título:" humano, lo ajustamos.
-    parts = []
-    parts.append(f"FECHA: {target}")
-    parts.append(f"MY_POEM_TITLE: {my_poem_title}".rstrip())
-    parts.append(f"POETA: {poeta}".rstrip())
-    parts.append(f"POEM_TITLE: {poem_title}".rstrip())
-    parts.append(f"BOOK_TITLE: {book_title}".rstrip())
-    parts.append("")  # línea en blanco
-
-    parts.append("# POEMA")
-    parts.append(normalize_text_for_hash(poema))
-    parts.append("")
-
-    parts.append("# POEMA_CITADO")
-    parts.append(normalize_text_for_hash(poema_citado))
-    parts.append("")
-
-    parts.append("# TEXTO")
-    parts.append(normalize_text_for_hash(texto))
-    parts.append("")
+    # Los metadatos llegan ya strip()eados desde publish_one_date: solo el valor
+    # vacío necesita tratamiento ("KEY:" sin espacio final, como el rstrip de antes).
+    return (
+        f"FECHA: {target}\n"
+        f"{_meta_line('MY_POEM_TITLE', my_poem_title)}\n"
+        f"{_meta_line('POETA', poeta)}\n"
+        f"{_meta_line('POEM_TITLE', poem_title)}\n"
+        f"{_meta_line('BOOK_TITLE', book_title)}\n"
+        "\n"
+        f"# POEMA\n{poema}\n"
+        "\n"
+        f"# POEMA_CITADO\n{poema_citado}\n"
+        "\n"
+        f"# TEXTO\n{texto}\n"
+    )
 
-    return "\n".join(parts)
-
-def write_txt_atomic(path: Path, content: str) -> None:
-    """
-    Escritura atómica: escribe a temp y luego renombra.
-    No deja .bak permanente.
-    """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content, encoding="utf-8")
-    tmp.replace(path)
+def _meta_line(key: str, value: str) -> str:
+    return f"{key}: {value}" if value else f"{key}:"
 
 def generate_keywords_from_txt(txt_path: Path) -> list[dict]:
     """
@@ -483,14 +515,16 @@ def generate_keywords_from_txt(txt_path: Path) -> list[dict]:
         raise RuntimeError("No encuentro core/gen_keywords.py para generar keywords.")
 
     cmd = [sys.executable, str(script), str(txt_path)]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # bytes: json_loads parsea UTF-8 directo; solo se decodifica para el error
+    proc = subprocess.run(cmd, capture_output=True)
 
     if proc.returncode != 0:
-        raise RuntimeError(f"Falló generación de keywords:\n{proc.stderr or proc.stdout}")
+        msg = (proc.stderr or proc.stdout or b"").decode("utf-8", "replace")
+        raise RuntimeError(f"Falló generación de keywords:\n{msg}")
 
     try:
-        obj = json.loads(proc.stdout)
-    except json.JSONDecodeError:
+        obj = json_loads(proc.stdout)
+    except ValueError:
         raise RuntimeError("gen_keywords.py no devolvió JSON válido.")
 
         # gen_keywords.py devuelve {"keywords":[...]}
@@ -518,18 +552,44 @@ def find_script(*relpaths: str) -> Path:
             return p
     raise RuntimeError(f"No encuentro script. Probé: {', '.join(relpaths)}")
 
-def run_validate_and_normalize_txt(date_str: str, txt_path: Path, pdf_mode: bool = False) -> None:
+def start_validate_txt(date_str: str, txt_path: Path) -> subprocess.Popen:
+    """
+    Lanza validate_entry.py --mode normalize sin esperar. Solo LEE el .txt, así que
+    puede correr en paralelo con los prompts del publish gate mientras el .txt no cambie.
+    """
+    script = find_script("core/validate_entry.py", "scripts/validate_entry.py", "validate_entry.py")
+    cmd = [sys.executable, str(script), "--mode", "normalize", date_str, str(txt_path)]
+    # bytes: validate_entry escribe UTF-8 siempre (sin depender del locale)
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def run_validate_and_normalize_txt(
+    date_str: str,
+    txt_path: Path,
+    pdf_mode: bool = False,
+    proc: Optional[subprocess.Popen] = None,
+    txt_mtime_ns: Optional[int] = None,
+) -> None:
     """
     Valida y normaliza metadata/headers del .txt (idempotente).
     En modo PDF, permitimos que validate_entry.py falle SOLO por secciones vacías
     (# POEMA_CITADO y/o # TEXTO), porque esa es precisamente la señal del PDF.
+    proc: un start_validate_txt() ya lanzado (si no, se lanza aquí).
+    txt_mtime_ns: st_mtime_ns del .txt justo antes de lanzar proc.
     """
-    script = find_script("core/validate_entry.py", "scripts/validate_entry.py", "validate_entry.py")
-    cmd = [sys.executable, str(script), "--mode", "normalize", date_str, str(txt_path)]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc is None:
+        txt_mtime_ns = txt_path.stat().st_mtime_ns
+        proc = start_validate_txt(date_str, txt_path)
+    stdout, stderr = proc.communicate()
+
+    if txt_mtime_ns is not None and txt_path.stat().st_mtime_ns != txt_mtime_ns:
+        # el resultado corresponde a una lectura vieja: validar el .txt actual
+        println("[qcrear] El .txt cambió durante la validación; valido de nuevo…")
+        run_validate_and_normalize_txt(date_str, txt_path, pdf_mode=pdf_mode)
+        return
 
     if proc.returncode != 0:
-        msg = (proc.stderr or proc.stdout or "").strip()
+        msg = (stderr or stdout or b"").decode("utf-8", "replace").strip()
 
         if pdf_mode:
             # Mensajes típicos del validador
@@ -546,7 +606,7 @@ def run_validate_and_normalize_txt(date_str: str, txt_path: Path, pdf_mode: bool
         raise RuntimeError(msg or "validate_entry.py falló")
 
     try:
-        payload = json.loads(proc.stdout)
+        payload = json.loads(stdout)
     except Exception:
         raise RuntimeError("validate_entry.py no devolvió JSON válido")
 
@@ -578,46 +638,22 @@ def run_merge_pending(
     if dry_run:
         cmd.append("--dry-run")
 
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    out = (proc.stdout or "") + ("\n" + proc.stderr if proc.stderr else "")
+    proc = subprocess.run(cmd, capture_output=True)
+    out = (proc.stdout or b"") + (b"\n" + proc.stderr if proc.stderr else b"")
     if proc.returncode != 0:
-        raise RuntimeError(out.strip() or "merge_pending.py falló")
+        raise RuntimeError(out.decode("utf-8", "replace").strip() or "merge_pending.py falló")
 
+    # Escaneo en bytes; solo la línea STATUS_JSON se parsea (json_loads acepta bytes)
     status_line = None
     for line in out.splitlines():
-        if line.startswith("STATUS_JSON="):
-            status_line = line.split("=", 1)[1].strip()
+        if line.startswith(b"STATUS_JSON="):
+            status_line = line.split(b"=", 1)[1].strip()
             break
     if not status_line:
         raise RuntimeError("merge_pending.py no emitió STATUS_JSON=")
 
-    return json.loads(status_line)
-
-def apply_pending_entry_into_archivo(date_str: str, pending_entry_path: Path, archivo_path: Path) -> None:
-    """
-    Inserta/reemplaza entry por fecha en archivo.json y ordena desc por date.
-    """
-    pending = json.loads(pending_entry_path.read_text(encoding="utf-8"))
-    if not isinstance(pending, dict) or pending.get("date") != date_str:
-        raise RuntimeError("pending_entry.json inválido o fecha no coincide")
-
-    data = json.loads(archivo_path.read_text(encoding="utf-8"))
-    entries = data.get("entries") if isinstance(data, dict) else data
-    if not isinstance(entries, list):
-        raise RuntimeError("archivo.json inválido: raíz no es lista ni {'entries': [...]}")
+    return json_loads(status_line)
 
-    entries = [e for e in entries if isinstance(e, dict) and e.get("date") != date_str]
-    entries.append(pending)
-    entries.sort(key=lambda e: e.get("date", ""), reverse=True)
-
-    # Mantener formato histórico (lista) como en qmp_publish.sh
-    archivo_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-
-def git(cmd: list[str]) -> str:
-    proc = subprocess.run(["git", *cmd], capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError((proc.stderr or proc.stdout or "").strip() or f"git {' '.join(cmd)} falló")
-    return (proc.stdout or "").strip()
 
 def ensure_on_branch(expected: str) -> None:
     cur = git(["rev-parse", "--abbrev-ref", "HEAD"]).strip()
@@ -626,7 +662,7 @@ def ensure_on_branch(expected: str) -> None:
 
 def clear_pending_keywords_placeholder() -> None:
     p = state_dir() / "pending_keywords.txt"
-    p.write_text('{\n  "date": "",\n  "keywords": []\n}\n', encoding="utf-8")
+    write_txt_atomic(p, '{\n  "date": "",\n  "keywords": []\n}\n')
 
 
 # -----------------------------
@@ -663,9 +699,11 @@ def get_gdocs_limit_date() -> date:
 # publish_one_date
 # -----------------------------
 
-def publish_one_date(target: str, defer_commit: bool = False) -> Optional[PublishResult]:
+def publish_one_date(target: str, archivo: object, defer_commit: bool = False) -> Optional[PublishResult]:
     """
     Procesa y publica una única fecha.
+    archivo: archivo.json ya parseado por el llamador (solo se usa para ver si
+    target ya está publicada).
 
     defer_commit=False (modo single):
         Hace todo: pull, generar .txt, keywords, archivo.json, git add/commit/push.
@@ -679,7 +717,6 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
         Lanza RuntimeError en errores duros (PDF no existe, análisis mal formado, etc.).
     """
     # --- ¿Ya publicada? ---
-    archivo = load_archivo_json()
     if date_exists_in_archivo(archivo, target):
         if not defer_commit:
             println("")
@@ -701,8 +738,12 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
     println(f" Pull Google Docs — {target}")
     println(SEP)
 
-    poem_obj = run_py_json("scripts/gdocs/gdocs_pull_poem_by_date.py", ["--date", target])
-    analysis_obj = run_py_json("scripts/gdocs/gdocs_pull_analysis_by_date.py", ["--date", target])
+    # Ambos pulls son red e independientes: en paralelo (como qcambiar)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_poem = ex.submit(run_py_json, "scripts/gdocs/gdocs_pull_poem_by_date.py", ["--date", target])
+        f_analysis = ex.submit(run_py_json, "scripts/gdocs/gdocs_pull_analysis_by_date.py", ["--date", target])
+        poem_obj = f_poem.result()
+        analysis_obj = f_analysis.result()
 
     my_poem_title = (poem_obj.get("title") or "").strip()
     poem_text = (poem_obj.get("poem") or "")
@@ -712,8 +753,14 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
     poema_citado = (analysis_obj.get("poem_citado") or "")
     texto = (analysis_obj.get("analysis") or "")
 
+    # Cada escrito se normaliza una sola vez; validación, fingerprint, resumen,
+    # preview y render_txt usan estas versiones
+    poem_n = normalize_text_for_hash(poem_text)
+    citado_n = normalize_text_for_hash(poema_citado)
+    texto_n = normalize_text_for_hash(texto)
+
     # --- Modo PDF ---
-    pdf_mode = (normalize_text_for_hash(poema_citado) == "")
+    pdf_mode = (citado_n == "")
     pdf_path = ""
     if pdf_mode:
         println("[qcrear] poema citado vacío → entrando en modo PDF")
@@ -737,22 +784,22 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
         println("[qcrear] PDF encontrado ✔")
 
     # --- Validación ---
-    if normalize_text_for_hash(poem_text) == "":
+    if poem_n == "":
         # En sweep: poema no encontrado = entrada incompleta en GDocs = skip silencioso
         if defer_commit:
             return None
         raise RuntimeError("ERROR: # POEMA está vacío (Google Docs). Corrige en el doc de POEMAS.")
     if not pdf_mode:
-        if normalize_text_for_hash(poema_citado) == "":
+        if citado_n == "":
             raise RuntimeError(
                 "ERROR: # POEMA_CITADO está vacío (Google Docs). Corrige en el doc de ESCRITOS."
             )
-        if normalize_text_for_hash(texto) == "":
+        if texto_n == "":
             raise RuntimeError(
                 "ERROR: # TEXTO está vacío (Google Docs). Corrige en el doc de ESCRITOS (Versión final)."
             )
 
-    fp = docs_fingerprint(poem_text, poema_citado, texto)
+    fp = docs_fingerprint_from_normalized(poem_n, citado_n, texto_n)
 
     # --- Resumen (solo en modo single) ---
     if not defer_commit:
@@ -764,10 +811,14 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
         println(f"  POEM_TITLE:    {poem_title or '(vacío)'}")
         println(f"  BOOK_TITLE:    {book_title or '(vacío)'}")
         println("")
+        # Un solo splitlines por escrito: conteo aquí y preview más abajo
+        poem_lines = poem_n.splitlines()
+        citado_lines = citado_n.splitlines()
+        texto_lines = texto_n.splitlines()
         println("Escritos (obligatorios):")
-        println(f"  # POEMA:        {len(normalize_text_for_hash(poem_text).splitlines())} líneas")
-        println(f"  # POEMA_CITADO: {len(normalize_text_for_hash(poema_citado).splitlines())} líneas")
-        println(f"  # TEXTO:        {len(normalize_text_for_hash(texto).splitlines())} líneas")
+        println(f"  # POEMA:        {len(poem_lines)} líneas")
+        println(f"  # POEMA_CITADO: {len(citado_lines)} líneas")
+        println(f"  # TEXTO:        {len(texto_lines)} líneas")
         println("")
         println(f"docs_fingerprint: {fp}")
 
@@ -778,15 +829,17 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
             println(SEP)
             println(" Preview (Google Docs)")
             println(SEP)
-            preview_block("# POEMA", poem_text, n=10)
-            preview_block("# POEMA_CITADO", poema_citado, n=10)
-            preview_block("# TEXTO", texto, n=10)
+            preview_block("# POEMA", poem_lines, n=10)
+            preview_block("# POEMA_CITADO", citado_lines, n=10)
+            preview_block("# TEXTO", texto_lines, n=10)
     else:
         println(f"[sweep] ✅ {target} — pull OK")
 
     # --- Generar .txt ---
-    existing_txt_fp = txt_fingerprint_from_file(txt_path) if txt_path.exists() else None
-    txt_matches_docs = (txt_path.exists() and existing_txt_fp == fp)
+    # Una sola lectura del .txt (None si no existe); fp nunca es None, así que
+    # la coincidencia implica que el archivo existe
+    existing_txt_fp = txt_fingerprint_from_file(txt_path)
+    txt_matches_docs = existing_txt_fp == fp
 
     if txt_matches_docs:
         println(f"[qcrear] ✅ El archivo ya coincide con Google Docs: {txt_path}")
@@ -805,7 +858,7 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
                     content = render_txt(
                         target=target, my_poem_title=my_poem_title, poeta=poeta,
                         poem_title=poem_title, book_title=book_title,
-                        poema=poem_text, poema_citado=poema_citado, texto=texto,
+                        poema=poem_n, poema_citado=citado_n, texto=texto_n,
                     )
                     write_txt_atomic(txt_path, content)
                     println(f"[qcrear] ✅ Generado: {txt_path}")
@@ -815,7 +868,7 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
                 content = render_txt(
                     target=target, my_poem_title=my_poem_title, poeta=poeta,
                     poem_title=poem_title, book_title=book_title,
-                    poema=poem_text, poema_citado=poema_citado, texto=texto,
+                    poema=poem_n, poema_citado=citado_n, texto=texto_n,
                 )
                 write_txt_atomic(txt_path, content)
                 println(f"[qcrear] ✅ Generado: {txt_path}")
@@ -824,7 +877,7 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
             content = render_txt(
                 target=target, my_poem_title=my_poem_title, poeta=poeta,
                 poem_title=poem_title, book_title=book_title,
-                poema=poem_text, poema_citado=poema_citado, texto=texto,
+                poema=poem_n, poema_citado=citado_n, texto=texto_n,
             )
             write_txt_atomic(txt_path, content)
             println(f"[qcrear] ✅ {target} — txt generado")
@@ -842,6 +895,8 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
 
     pending = load_pending_keywords()
     keywords = None
+    # Lo que hay en pending_keywords.txt al llegar al gate (sin releerlo)
+    pending_payload: Optional[dict] = None
 
     if pending:
         pdate = pending.get("date", "")
@@ -857,12 +912,15 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
                     println(f"  - {w} ({wt})")
                 use_existing = prompt_yn("[qcrear] ¿Usar estas keywords?", default_yes=True)
                 if use_existing:
+                    # Ya está en disco con esta fecha/fingerprint: no re-serializar
+                    # (solo cambiaría generated_at)
                     keywords = pkws
-                    write_pending_keywords(target, keywords, fp)
+                    pending_payload = pending
                     println("[qcrear] ✅ pending_keywords.txt confirmado.")
             else:
                 # Sweep: reutilizar silenciosamente si coincide
                 keywords = pkws
+                pending_payload = pending
 
     if keywords is None:
         if not defer_commit:
@@ -876,18 +934,16 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
         println(f"[qcrear] Generando keywords desde el .txt…")
         keywords = generate_keywords_from_txt(txt_path)
 
-        pairs = [(k["word"], k["weight"]) for k in keywords]
-        pairs.sort(key=lambda x: (-x[1], x[0].lower()))
-
         if not defer_commit:
+            # el orden solo hace falta para mostrarlas (el sweep no las muestra)
             println("Top keywords (nuevas):")
-            for w, wt in pairs[:10]:
+            for w, wt in top_keywords_preview({"keywords": keywords}, n=10):
                 println(f"  - {w} ({wt})")
             ok_kw = prompt_yn("[qcrear] ¿Confirmas estas keywords?", default_yes=True)
             if not ok_kw:
                 raise UserAbort()
 
-        write_pending_keywords(target, keywords, fp)
+        pending_payload = write_pending_keywords(target, keywords, fp)
 
         if not defer_commit:
             println("[qcrear] ✅ pending_keywords.txt actualizado.")
@@ -907,33 +963,48 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
     pending_kw_path = state_dir() / "pending_keywords.txt"
     pending_entry_path = state_dir() / "pending_entry.json"
 
-    if not defer_commit:
-        branch = git(["rev-parse", "--abbrev-ref", "HEAD"]).strip()
-        if branch != "main":
-            println("")
-            println(f"[qcrear] ⚠️  Estás en el branch '{branch}', no en 'main'.")
-            println("[qcrear] Esto publicará los cambios en ESTE branch.")
-            ok_branch = prompt_yn(
-                f"[qcrear] ¿Publicar de todos modos en '{branch}'?", default_yes=False
-            )
-            if not ok_branch:
-                println("[qcrear] OK. Publicación cancelada.")
-                return None
-        println(f"[qcrear] Publicando desde branch: {branch}")
-
-    # Validar keywords vigentes
-    pending = load_pending_keywords()
-    if not pending:
-        raise RuntimeError("No hay pending_keywords vigentes. No se puede publicar.")
-    if (pending.get("date") or "").strip() != target:
-        raise RuntimeError("pending_keywords date != target. No se puede publicar.")
-    if not (pending.get("keywords") or []):
-        raise RuntimeError("pending_keywords está vacío. No se puede publicar.")
-    if (pending.get("docs_fingerprint") or "").strip() != fp:
-        raise RuntimeError("pending_keywords fingerprint NO coincide con Google Docs. No se puede publicar.")
-
-    # Validar + normalizar .txt (idempotente)
-    run_validate_and_normalize_txt(target, txt_path, pdf_mode=pdf_mode)
+    # El .txt ya no cambia: validamos en segundo plano mientras se confirma el branch
+    # y se revisan las keywords. Si no llegamos a usarlo, se mata y se recoge.
+    txt_mtime_ns = txt_path.stat().st_mtime_ns
+    validate_proc = start_validate_txt(target, txt_path)
+    try:
+        if not defer_commit:
+            branch = git(["rev-parse", "--abbrev-ref", "HEAD"]).strip()
+            if branch != "main":
+                println("")
+                println(f"[qcrear] ⚠️  Estás en el branch '{branch}', no en 'main'.")
+                println("[qcrear] Esto publicará los cambios en ESTE branch.")
+                ok_branch = prompt_yn(
+                    f"[qcrear] ¿Publicar de todos modos en '{branch}'?", default_yes=False
+                )
+                if not ok_branch:
+                    println("[qcrear] OK. Publicación cancelada.")
+                    return None
+            println(f"[qcrear] Publicando desde branch: {branch}")
+
+        # Validar keywords vigentes (mismo objeto que está en disco; se valida igual que al leerlo)
+        if pending_payload is not None:
+            pending = validate_pending_keywords(pending_payload)
+        else:
+            pending = load_pending_keywords()
+        if not pending:
+            raise RuntimeError("No hay pending_keywords vigentes. No se puede publicar.")
+        if (pending.get("date") or "").strip() != target:
+            raise RuntimeError("pending_keywords date != target. No se puede publicar.")
+        if not (pending.get("keywords") or []):
+            raise RuntimeError("pending_keywords está vacío. No se puede publicar.")
+        if (pending.get("docs_fingerprint") or "").strip() != fp:
+            raise RuntimeError("pending_keywords fingerprint NO coincide con Google Docs. No se puede publicar.")
+
+        # Validar + normalizar .txt (idempotente)
+        run_validate_and_normalize_txt(
+            target, txt_path, pdf_mode=pdf_mode, proc=validate_proc, txt_mtime_ns=txt_mtime_ns
+        )
+    finally:
+        if validate_proc.returncode is None:
+            # gate no alcanzado (return / excepción): no dejar el hijo ni sus pipes colgando
+            validate_proc.kill()
+            validate_proc.communicate()
 
     # merge_pending (aplica keywords → pending_entry.json + status)
     status = run_merge_pending(
@@ -948,7 +1019,7 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
     # PDF: inyectar ruta en pending_entry.json
     if pdf_mode:
         try:
-            pending_obj = json.loads(pending_entry_path.read_text(encoding="utf-8"))
+            pending_obj = json_loads(pending_entry_path.read_bytes())
         except Exception:
             raise RuntimeError("pending_entry.json no es JSON válido (después de merge_pending)")
         if not isinstance(pending_obj, dict):
@@ -957,10 +1028,7 @@ def publish_one_date(target: str, defer_commit: bool = False) -> Optional[Publis
         if not isinstance(pending_obj["analysis"], dict):
             raise RuntimeError("pending_entry.json inválido: analysis no es dict")
         pending_obj["analysis"]["pdf"] = pdf_path
-        pending_entry_path.write_text(
-            json.dumps(pending_obj, ensure_ascii=False, indent=2) + "\n",
-            encoding="utf-8",
-        )
+        pending_entry_path.write_text(json_dumps_pretty(pending_obj) + "\n", encoding="utf-8")
         println(f"[qcrear] analysis.pdf = {pdf_path}")
 
     exists_before = bool(status.get("exists_before"))
@@ -1060,7 +1128,8 @@ def run_sweep() -> int:
         target = current.isoformat()
         println(f"\n[sweep] → {target}")
         try:
-            result = publish_one_date(target, defer_commit=True)
+            # archivo del inicio: lo que el sweep agrega son fechas anteriores a target
+            result = publish_one_date(target, archivo, defer_commit=True)
             if result is not None:
                 results.append(result)
                 println(f"[sweep] ✔ {target} — listo para commit")
@@ -1149,8 +1218,9 @@ def main() -> int:
             return run_sweep()
 
         # Modo single-date (comportamiento original)
-        target = choose_target_date(sys.argv)
-        publish_one_date(target, defer_commit=False)
+        archivo = load_archivo_json()
+        target = choose_target_date(sys.argv, archivo)
+        publish_one_date(target, archivo, defer_commit=False)
         return 0
 
     except UserAbort:
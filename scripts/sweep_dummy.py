@@ -4,7 +4,8 @@ from pathlib import Path
 ARCHIVO = Path("data/archivo.json")
 
 def main():
-    data = json.loads(ARCHIVO.read_text(encoding="utf-8"))
+    # bytes: json.loads detecta UTF-8 solo, sin pasar por text IO
+    data = json.loads(ARCHIVO.read_bytes())
     entradas = data if isinstance(data, list) else data.get("entradas", [])
 
     fechas = sorted(
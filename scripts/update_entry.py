@@ -35,8 +35,8 @@ def state_dir() -> Path:
     return REPO_ROOT / "state"
 
 def txt_path_for_date(date: str) -> Path:
-    y, m, _ = date.split("-")
-    return data_dir() / "textos" / y / m / f"{date}.txt"
+    # date ya validado como YYYY-MM-DD: año y mes por posición
+    return data_dir() / "textos" / date[:4] / date[5:7] / f"{date}.txt"
 
 def archivo_json_path() -> Path:
     return data_dir() / "archivo.json"
@@ -57,16 +57,18 @@ def run_py_json(script_relpath: str, args: list[str]) -> dict:
     """Ejecuta un script Python del repo y parsea su stdout como JSON."""
     script = REPO_ROOT / script_relpath
     cmd = [sys.executable, str(script), *args]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # bytes: json.loads acepta UTF-8 directo; solo se decodifica para mensajes de error
+    proc = subprocess.run(cmd, capture_output=True)
     if proc.returncode != 0:
         raise RuntimeError(
             f"{script_relpath} falló (exit {proc.returncode}):\n"
-            f"{(proc.stderr or proc.stdout or '').strip()}"
+            f"{(proc.stderr or proc.stdout or b'').decode('utf-8', 'replace').strip()}"
         )
     try:
-        return json.loads(proc.stdout.strip())
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"{script_relpath} no devolvió JSON válido: {e}\nStdout: {proc.stdout[:400]}")
+        return json.loads(proc.stdout)
+    except ValueError as e:  # JSONDecodeError o UTF-8 inválido
+        out = proc.stdout.decode("utf-8", "replace")
+        raise RuntimeError(f"{script_relpath} no devolvió JSON válido: {e}\nStdout: {out[:400]}")
 
 def git(cmd: list[str]) -> str:
     proc = subprocess.run(["git", *cmd], capture_output=True, text=True, cwd=str(REPO_ROOT))
@@ -159,10 +161,11 @@ def generate_keywords(txt_path: Path) -> list[dict]:
     script = _find_script("core/gen_keywords.py")
     proc = subprocess.run(
         [sys.executable, str(script), str(txt_path)],
-        capture_output=True, text=True,
+        capture_output=True,
     )
     if proc.returncode != 0:
-        raise RuntimeError(f"gen_keywords.py falló:\n{(proc.stderr or proc.stdout or '').strip()}")
+        msg = (proc.stderr or proc.stdout or b"").decode("utf-8", "replace").strip()
+        raise RuntimeError(f"gen_keywords.py falló:\n{msg}")
     obj = json.loads(proc.stdout)
     kws = obj.get("keywords", obj) if isinstance(obj, dict) else obj
     if not isinstance(kws, list) or not kws: